@@ -6,12 +6,82 @@ This module provides a flexible BM25 classifier that can classify articles
 based on keyword matching using the BM25 scoring algorithm.
 """
 
+import itertools
+from collections import Counter
 import pandas as pd
 import numpy as np
-from rank_bm25 import BM25Okapi
 from typing import List, Union, Optional
 
 
+class _BM25Index:
+    """
+    Okapi BM25 index over a tokenized corpus, computed with NumPy.
+    
+    Scores match rank_bm25.BM25Okapi (same k1, b, epsilon and IDF floor), but
+    the corpus is stored as flat (document, term, frequency) arrays, so scoring
+    a query is a few vectorized operations instead of a Python loop over every
+    document for every query token.
+    """
+    
+    def __init__(self, tokenized_corpus: List[List[str]], k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        """
+        Build the index.
+        
+        Args:
+            tokenized_corpus: List of token lists, one per document
+            k1: Term frequency saturation parameter
+            b: Document length normalization parameter
+            epsilon: Floor for negative IDF values, as a fraction of the mean IDF
+        """
+        self.k1 = k1
+        self.b = b
+        self.corpus_size = len(tokenized_corpus)
+        self.doc_len = np.fromiter(map(len, tokenized_corpus), dtype=np.int64, count=self.corpus_size)
+        self.avgdl = self.doc_len.sum() / self.corpus_size
+        
+        # Map every token in the corpus to an integer term id
+        tokens = np.array(list(itertools.chain.from_iterable(tokenized_corpus)), dtype=object)
+        term_ids, vocab = pd.factorize(tokens)
+        self.vocab = pd.Index(vocab)
+        n_terms = len(vocab)
+        doc_ids = np.repeat(np.arange(self.corpus_size), self.doc_len)
+        
+        # Frequency of each distinct (document, term) pair
+        pairs, self.freqs = np.unique(doc_ids * n_terms + term_ids, return_counts=True)
+        self.pair_docs = pairs // max(n_terms, 1)
+        self.pair_terms = pairs % max(n_terms, 1)
+        
+        # IDF with BM25Okapi's floor: negative values become epsilon * mean IDF
+        doc_freq = np.bincount(self.pair_terms, minlength=n_terms)
+        self.idf = np.log(self.corpus_size - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if n_terms:
+            self.idf[self.idf < 0] = epsilon * self.idf.mean()
+    
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """
+        Score every document in the corpus against a query.
+        
+        Args:
+            query: List of query tokens
+            
+        Returns:
+            Array of BM25 scores, one per document
+        """
+        query_ids = self.vocab.get_indexer(query)
+        query_ids = query_ids[query_ids >= 0]
+        
+        # IDF of each term, counted once per occurrence in the query
+        weights = np.bincount(query_ids, minlength=len(self.idf)) * self.idf
+        
+        in_query = weights[self.pair_terms] != 0
+        docs = self.pair_docs[in_query]
+        tf = self.freqs[in_query]
+        norm = self.k1 * (1 - self.b + self.b * self.doc_len[docs] / self.avgdl)
+        contributions = weights[self.pair_terms[in_query]] * tf * (self.k1 + 1) / (tf + norm)
+        
+        return np.bincount(docs, weights=contributions, minlength=self.corpus_size)
+
+
 class BM25KeywordClassifier:
     """
     BM25-based keyword classifier for text classification.
@@ -30,6 +100,14 @@ class BM25KeywordClassifier:
         self.keywords = keywords
         self.bm25 = None
         
+        # Tokenize the keywords once; they are the same for every document
+        self.keyword_tokens = [
+            token for keyword in keywords for token in self._preprocess_text(keyword)
+        ]
+        # Query for BM25 scoring, with duplicates removed while preserving order
+        self.query_tokens = list(dict.fromkeys(self.keyword_tokens))
+        self.keyword_token_set = frozenset(self.keyword_tokens)
+        
     def _preprocess_text(self, text: str) -> List[str]:
         """
         Preprocess text by converting to lowercase and splitting into tokens.
@@ -54,11 +132,12 @@ class BM25KeywordClassifier:
         Returns:
             self
         """
-        # Preprocess all documents
+        # Tokenize documents exactly like the keywords: Python's str.lower() differs
+        # from pandas' Arrow-backed .str.lower() for e.g. Turkish and Greek text
         tokenized_corpus = [self._preprocess_text(doc) for doc in corpus]
         
         # Initialize BM25
-        self.bm25 = BM25Okapi(tokenized_corpus)
+        self.bm25 = _BM25Index(tokenized_corpus)
         
         return self
     
@@ -75,11 +154,6 @@ class BM25KeywordClassifier:
         if self.bm25 is None:
             raise ValueError("BM25 model not fitted. Call fit() first.")
         
-        # Tokenize query (keywords)
-        query_tokens = []
-        for keyword in self.keywords:
-            query_tokens.extend(self._preprocess_text(keyword))
-        
         # Get BM25 score for this document's index
         # Since we need to score against pre-fitted corpus, we'll use a different approach
         # We'll compute scores for all docs and return the relevant one
@@ -88,15 +162,13 @@ class BM25KeywordClassifier:
         # For single scoring, we tokenize the text and match against keywords
         doc_tokens = self._preprocess_text(text)
         
+        # Documents that share no token with the keywords score zero
+        if self.keyword_token_set.isdisjoint(doc_tokens):
+            return 0.0
+        
         # Count keyword matches (simple approach for single doc)
-        score = 0.0
-        for keyword in self.keywords:
-            keyword_tokens = self._preprocess_text(keyword)
-            for token in keyword_tokens:
-                if token in doc_tokens:
-                    score += doc_tokens.count(token)
-        
-        return score
+        token_counts = Counter(doc_tokens)
+        return float(sum(token_counts[token] for token in self.keyword_tokens))
     
     def classify_dataframe(
         self,
@@ -132,16 +204,8 @@ class BM25KeywordClassifier:
         # Fit BM25 on the corpus
         self.fit(corpus)
         
-        # Tokenize query (keywords)
-        query_tokens = []
-        for keyword in self.keywords:
-            query_tokens.extend(self._preprocess_text(keyword))
-        
-        # Remove duplicates while preserving order
-        query_tokens = list(dict.fromkeys(query_tokens))
-        
         # Get BM25 scores for all documents
-        scores = self.bm25.get_scores(query_tokens)
+        scores = self.bm25.get_scores(self.query_tokens)
         
         # Add scores to dataframe
         df_copy[score_column] = scores
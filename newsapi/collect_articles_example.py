@@ -69,7 +69,7 @@ def main():
     filtered_sources = filter_sources_by_languages(sources, target_languages)
     
     print(f"\nFiltered sources by language:")
-    print(filtered_sources['dominant_language'].value_counts())
+    print(filtered_sources['dominant_language'].value_counts().loc[lambda counts: counts > 0])
     print(f"Total sources selected: {len(filtered_sources)}")
     print(f"Countries included: {sorted(filtered_sources['country_name'].unique())}")
 
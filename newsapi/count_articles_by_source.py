@@ -5,7 +5,7 @@ This script queries the API without any keyword or concept filters to get the to
 
 import os
 import sys
-import json
+import orjson
 import pandas as pd
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -103,8 +103,8 @@ def count_articles_by_source_and_month(sources_df: pd.DataFrame,
             
             # Load existing results for summary
             try:
-                with open(source_filepath, 'r', encoding='utf-8') as f:
-                    existing_result = json.load(f)
+                with open(source_filepath, 'rb') as f:
+                    existing_result = orjson.loads(f.read())
                     all_results.append(existing_result)
             except Exception as e:
                 print(f"  ⚠️  Warning: Could not load existing file: {e}")
@@ -164,8 +164,8 @@ def count_articles_by_source_and_month(sources_df: pd.DataFrame,
         source_filename = f"{source_uri}.json"
         source_filepath = os.path.join(output_dir, source_filename)
         
-        with open(source_filepath, 'w', encoding='utf-8') as f:
-            json.dump(source_counts, f, indent=2, ensure_ascii=False)
+        with open(source_filepath, 'wb') as f:
+            f.write(orjson.dumps(source_counts, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         print(f"\n  💾 Saved: {source_filepath}")
         print(f"  📊 Total articles: {total_articles:,}")
@@ -174,8 +174,8 @@ def count_articles_by_source_and_month(sources_df: pd.DataFrame,
     
     # Save summary file with all sources
     summary_filepath = os.path.join(output_dir, 'all_sources_summary.json')
-    with open(summary_filepath, 'w', encoding='utf-8') as f:
-        json.dump(all_results, f, indent=2, ensure_ascii=False)
+    with open(summary_filepath, 'wb') as f:
+        f.write(orjson.dumps(all_results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\n{'='*60}")
     print(f"✅ Processing complete!")
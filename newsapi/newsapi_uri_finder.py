@@ -85,10 +85,12 @@ def add_article_data(df):
     results = fetch_articles_concurrent(df['domain_url'].tolist())
     
     df['newsapi_results'] = results
-    df['source_uri'] = df['newsapi_results'].apply(lambda x: x['source_uri'])
-    df['articles'] = df['newsapi_results'].apply(lambda x: x['articles'])
-    df['articles_count'] = df['newsapi_results'].apply(lambda x: x['total_found'])
-    df['status'] = df['newsapi_results'].apply(lambda x: x['status'])
+    fields = pd.DataFrame(
+        [(r['source_uri'], r['articles'], r['total_found'], r['status']) for r in results],
+        columns=['source_uri', 'articles', 'articles_count', 'status'],
+        index=df.index,
+    )
+    df[fields.columns] = fields
     
     return df
 
@@ -0,0 +1,53 @@
+"""
+Shared loader for the article parquet datasets used by the plotting scripts.
+
+Parquet files are memory-mapped and decoded into Arrow tables once per
+(path, columns) combination, so scripts that run in the same Python process
+reuse the decoded data instead of reading the file again.
+"""
+
+import functools
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATASET_PATH = 'data/articles/lancet_europe_dataset_with_dummies.parquet'
+HEALTH_SUBSET_PATH = 'data/articles/lancet_europe_health_subset_with_dummies.parquet'
+MONTHLY_PATH = 'data/articles/lancet_europe_dataset_monthly.parquet'
+
+
+@functools.lru_cache(maxsize=None)
+def _read_table(path, columns, categories=None):
+    return pq.read_table(path, columns=list(columns) if columns else None, memory_map=True,
+                         read_dictionary=list(categories) if categories else None)
+
+
+def _arrow_dtype(pa_type):
+    # Dictionary columns fall through to pandas' own conversion, which gives a category
+    if pa.types.is_dictionary(pa_type):
+        return None
+    return pd.ArrowDtype(pa_type)
+
+
+def load_articles(path=DATASET_PATH, columns=None, categories=None):
+    """
+    Load an article dataset as a DataFrame with Arrow-backed dtypes.
+
+    Parameters:
+    -----------
+    path : str, optional
+        Path to the parquet file
+    columns : list or tuple, optional
+        Columns to read. If None, reads all columns
+    categories : list or tuple, optional
+        Low-cardinality string columns to keep dictionary-encoded and return
+        as pandas 'category' dtype instead of Arrow strings
+
+    Returns:
+    --------
+    pd.DataFrame
+        A new DataFrame; the cached Arrow table it is built from is never modified
+    """
+    table = _read_table(path, tuple(columns) if columns else None,
+                        tuple(categories) if categories else None)
+    return table.to_pandas(types_mapper=_arrow_dtype)
@@ -12,8 +12,8 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from visualize_article_map import load_shapefile, df_country
-from plot_time_series import plot_combined_maps_and_timeseries, df_grouped
+from visualize_article_map import load_shapefile, load_country_df
+from plot_time_series import plot_combined_maps_and_timeseries, load_grouped
 import matplotlib.pyplot as plt
 
 if __name__ == "__main__":
@@ -25,7 +25,7 @@ if __name__ == "__main__":
     gdf = load_shapefile()
     
     # Create combined visualization
-    fig = plot_combined_maps_and_timeseries(df_grouped, df_country, gdf)
+    fig = plot_combined_maps_and_timeseries(load_grouped(), load_country_df(), gdf)
     
     print("\n" + "=" * 70)
     print("Visualization complete!")
@@ -1,15 +1,51 @@
 import pandas as pd
+import matplotlib as mpl
+mpl.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-import geopandas as gpd
 import numpy as np
-import sys
 import warnings
 import ast
+import pyarrow as pa
+import pyarrow.compute as pc
+from load_articles import load_articles, HEALTH_SUBSET_PATH
 warnings.filterwarnings('ignore', category=UserWarning)
 pd.set_option('display.max_columns', None)
-pd.set_option('display.max_rows', None)
 
-df = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet')
+# Shared style for both figures, applied once via rc_context. Agg also
+# simplifies line paths and draws long paths in chunks.
+PLOT_STYLE = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+    'axes.spines.top': False,
+    'axes.spines.right': False,
+    'axes.linewidth': 1.5,
+}
+
+# Arrow-backed dtypes keep strings and lists in contiguous buffers instead of Python objects
+df = load_articles(HEALTH_SUBSET_PATH, columns=['inequality_types', 'date', 'inequality'])
+
+
+def save_figure(fig, output_file, dpi=300):
+    """
+    Save a figure cropped to its tight bounding box.
+    
+    The bounding box is measured once from a screen-resolution draw and passed
+    to savefig, so the figure is only rendered once at the output dpi.
+    
+    Parameters:
+    -----------
+    fig : matplotlib Figure
+        Figure to save
+    output_file : str
+        Path of the image to write
+    dpi : int
+        Output resolution
+    """
+    fig.canvas.draw()
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.1)
+    fig.savefig(output_file, dpi=dpi, bbox_inches=bbox, facecolor='white')
+
 
 # Parse types column if it's stored as string
 print("Checking types column format...")
@@ -18,85 +54,86 @@ print(f"Type: {type(df['inequality_types'].iloc[0])}")
 
 if isinstance(df['inequality_types'].iloc[0], str):
     print("Converting types from string to list...")
-    df['inequality_types'] = df['inequality_types'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) and x else [])
+    # Parse each distinct "['a', 'b']" string once with ast.literal_eval, then
+    # expand to every row with an Arrow take; missing or empty values become []
+    codes, uniques = pd.factorize(df['inequality_types'])
+    parsed = [ast.literal_eval(x) if x else [] for x in uniques] + [[]]
+    codes[codes < 0] = len(uniques)
+    types_list = pa.array(parsed, type=pa.list_(pa.string())).take(pa.array(codes))
+    df['inequality_types'] = pd.Series(pd.arrays.ArrowExtensionArray(types_list), index=df.index)
     print("Conversion complete!")
 
 # Parse types lists and count occurrences
 total_rows = len(df)
-types_exploded = df['inequality_types'].explode()
-type_counts = types_exploded.value_counts()
-type_percentages = (type_counts / total_rows * 100).sort_values()
-
-# Create bar chart of inequality types
-print("\n" + "="*60)
-print("CREATING INEQUALITY TYPES BAR CHART")
-print("="*60)
-
-# Ensure output directory exists
-import os
-os.makedirs('plots/images', exist_ok=True)
-
-fig_types, ax_types = plt.subplots(figsize=(10, 8))
-
-# Create horizontal bar chart with thinner bars
-bars = ax_types.barh(type_percentages.index, type_percentages.values,
-                     height=0.6, color='#0072B2', alpha=0.8, edgecolor='#0072B2', linewidth=2)
-
-# Add percentage labels on bars
-for i, (bar, value) in enumerate(zip(bars, type_percentages.values)):
-    ax_types.text(value + 0.2, i, f'{value:.1f}%', 
-                  va='center', fontsize=10, fontweight='normal')
-
-# Customize chart
-ax_types.set_xlabel('Percentage of Articles (%)', fontsize=12, fontweight='bold')
-ax_types.set_title('Distribution of Inequality Types in Climate-Health Articles', 
-                   fontsize=14, fontweight='bold', pad=20)
-
-# Styling
-ax_types.spines['top'].set_visible(False)
-ax_types.spines['right'].set_visible(False)
-ax_types.spines['left'].set_linewidth(1.5)
-ax_types.spines['bottom'].set_linewidth(1.5)
-ax_types.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.8)
-
-plt.tight_layout()
-plt.savefig('plots/images/figure4.png', dpi=300, bbox_inches='tight', facecolor='white')
-print("\nInequality types bar chart saved to 'plots/images/figure4.png'")
-plt.close()
+# Flatten and count with Arrow kernels instead of exploding into a pandas Series
+types_flat = pc.drop_null(pc.list_flatten(pa.array(df['inequality_types'])))
+if isinstance(types_flat, pa.ChunkedArray):
+    types_flat = types_flat.combine_chunks()
+# Dictionary-encode the small type vocabulary so counting hashes int32 indices
+types_dict = types_flat.dictionary_encode()
+types_vc = pc.value_counts(types_dict.indices)
+# Sort once, ascending, so the largest bar ends up at the top of the chart
+types_vc = types_vc.take(pc.array_sort_indices(types_vc.field('counts')))
+type_counts = pd.Series(types_vc.field('counts').to_numpy(),
+                        index=types_dict.dictionary.take(types_vc.field('values')).to_pylist())
+type_percentages = type_counts / total_rows * 100
 
 # Create monthly master file
-# Convert date to datetime and extract year-month
-df['date'] = pd.to_datetime(df['date'])
-df['year_month'] = df['date'].dt.to_period('M')
-
-# Count total articles and inequality articles by month
-monthly_total = df.groupby('year_month').size().reset_index(name='total_articles')
-monthly_inequality = df[df['inequality'] == 1].groupby('year_month').size().reset_index(name='inequality_articles')
+# Convert date to datetime and key each article by its month as an int32
+# (months since 1970-01) rather than a Period object
+dates = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[ns]')
+year_month = dates.astype('datetime64[M]').astype('int32')
 
-# Merge the two dataframes
-monthly_master = pd.merge(monthly_total, monthly_inequality, on='year_month', how='left')
+# Count total articles and inequality articles by month in a single groupby pass
+monthly_master = df.groupby(year_month, sort=True).agg(
+    total_articles=('inequality', 'size'),
+    inequality_articles=('inequality', 'sum')
+).astype('int64')
 
-# Create complete date range from 2023-01 to 2025-09
-date_range = pd.period_range(start='2023-01', end='2025-09', freq='M')
-complete_months = pd.DataFrame({'year_month': date_range})
+# Create complete month range from 2023-01 to 2025-09
+month_range = np.arange(np.datetime64('2023-01', 'M'), np.datetime64('2025-10', 'M'))
 
-# Merge with complete date range and fill missing values with 0
-monthly_master = pd.merge(complete_months, monthly_master, on='year_month', how='left').fillna(0)
+# Align to the complete month range, filling missing months with 0
+monthly_master = monthly_master.reindex(month_range.astype('int32'), fill_value=0)
 
 # Calculate percentage of inequality articles
 monthly_master['inequality_percentage'] = (monthly_master['inequality_articles'] / monthly_master['total_articles'] * 100).fillna(0)
 
-# Convert year_month to timestamp for plotting
-monthly_master['date'] = monthly_master['year_month'].dt.to_timestamp()
+# Convert month keys to timestamps for plotting
+monthly_master['date'] = month_range.astype('datetime64[ns]')
+monthly_master = monthly_master.reset_index(drop=True)
 
 # Monthly master file created (not saved to disk)
 
-# Create attractive standalone time series plot
-print("\n" + "="*60)
-print("CREATING INEQUALITY TIME SERIES PLOT")
-print("="*60)
 
-def create_inequality_timeseries(monthly_data, figsize=(14, 7)):
+def plot_inequality_types(ax, type_percentages):
+    """
+    Draw a horizontal bar chart of the share of articles mentioning each
+    inequality type.
+    
+    Parameters:
+    -----------
+    ax : matplotlib axis
+        Axis to draw on
+    type_percentages : Series
+        Percentage of articles per inequality type, indexed by type
+    """
+    # Create horizontal bar chart with thinner bars
+    bars = ax.barh(type_percentages.index, type_percentages.values,
+                   height=0.6, color='#0072B2', alpha=0.8, edgecolor='#0072B2', linewidth=2)
+    
+    # Add percentage labels on bars
+    ax.bar_label(bars, labels=[f'{value:.1f}%' for value in type_percentages.values],
+                 padding=3, fontsize=10, fontweight='normal')
+    
+    # Customize chart
+    ax.set_xlabel('Percentage of Articles (%)', fontsize=12, fontweight='bold')
+    ax.set_title('Distribution of Inequality Types in Climate-Health Articles', 
+                 fontsize=14, fontweight='bold', pad=20)
+    ax.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.8)
+
+
+def create_inequality_timeseries(monthly_data, ax):
     """
     Create an attractive time series plot showing the proportion of 
     climate-health articles discussing inequality over time.
@@ -105,15 +142,9 @@ def create_inequality_timeseries(monthly_data, figsize=(14, 7)):
     -----------
     monthly_data : DataFrame
         Monthly data with columns: date, inequality_percentage, total_articles, inequality_articles
-    figsize : tuple
-        Figure size (width, height)
-    
-    Returns:
-    --------
-    fig, ax : matplotlib figure and axis objects
+    ax : matplotlib axis
+        Axis to draw on
     """
-    fig, ax = plt.subplots(figsize=figsize)
-    
     # Calculate smooth trendline using polynomial regression
     # Convert dates to numeric values for fitting
     monthly_data_clean = monthly_data.dropna(subset=['inequality_percentage']).copy()
@@ -121,60 +152,75 @@ def create_inequality_timeseries(monthly_data, figsize=(14, 7)):
     y = monthly_data_clean['inequality_percentage'].values
     
     # Fit a polynomial (degree 3 for smooth curve)
-    z = np.polyfit(x_numeric, y, 3)
-    p = np.poly1d(z)
-    y_trend = p(x_numeric)
+    coef = np.polynomial.polynomial.polyfit(x_numeric, y, 3)
+    y_trend = np.polynomial.polynomial.polyval(x_numeric, coef)
     
     # Plot smooth light grey trendline
-    ax.plot(monthly_data_clean['date'], y_trend, 
-            linewidth=4.5, color='#CCCCCC', alpha=0.8,
-            label='Trend', zorder=1)
+    trend_line, = ax.plot(monthly_data_clean['date'], y_trend, 
+                          linewidth=4.5, color='#CCCCCC', alpha=0.8,
+                          zorder=1)
     
-    # Plot the main line with markers
-    ax.plot(monthly_data['date'], monthly_data['inequality_percentage'], 
-            marker='o', linewidth=3.5, markersize=7, 
-            color='#0072B2', alpha=0.8,
-            markerfacecolor='#0072B2', markeredgecolor='white', 
-            markeredgewidth=1.5, label='Monthly percentage', zorder=2)
+    # Plot the main line, then all markers as a single scatter collection
+    main_line, = ax.plot(monthly_data['date'], monthly_data['inequality_percentage'], 
+                         linewidth=3.5, color='#0072B2', alpha=0.8, zorder=2)
+    markers = ax.scatter(monthly_data['date'], monthly_data['inequality_percentage'],
+                         s=49, color='#0072B2', alpha=0.8,
+                         edgecolors='white', linewidths=1.5, zorder=2)
     
     # Customize axes
     ax.set_xlabel('Month', fontsize=13, fontweight='bold')
     ax.set_ylabel('Percentage of Articles (%)', fontsize=13, fontweight='bold')
     
     # Add legend positioned at y=42 on the plot, centered horizontally
-    ax.legend(frameon=True, fontsize=11, loc='center', 
+    # (line and markers are overlaid into a single legend entry)
+    ax.legend(handles=[trend_line, (main_line, markers)],
+             labels=['Trend', 'Monthly percentage'],
+             frameon=True, fontsize=11, loc='center', 
              framealpha=0.95, edgecolor='gray', bbox_to_anchor=(0.5, 0.95), ncol=2)
     
-    # Styling
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
-    
     # Set x-axis ticks to show all months
     ax.set_xticks(monthly_data['date'])
     
     # Label every other month on x-axis
-    labels = []
-    for i, date in enumerate(monthly_data['date']):
-        if i % 2 == 0:
-            labels.append(date.strftime('%Y-%m-%d'))
-        else:
-            labels.append('')
+    labels = pd.DatetimeIndex(monthly_data['date']).strftime('%Y-%m-%d').to_numpy(dtype=object)
+    labels[1::2] = ''
     ax.set_xticklabels(labels)
     
     # Format x-axis dates
     plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+
+# Ensure output directory exists
+import os
+os.makedirs('plots/images', exist_ok=True)
+
+# Render both charts on one reused figure
+with plt.rc_context(PLOT_STYLE):
+    fig = plt.figure(figsize=(10, 8))
     
-    plt.tight_layout()
+    # Create bar chart of inequality types
+    print("\n" + "="*60)
+    print("CREATING INEQUALITY TYPES BAR CHART")
+    print("="*60)
     
-    return fig, ax
-
-# Create and save the time series plot
-fig_ts, ax_ts = create_inequality_timeseries(monthly_master)
-plt.savefig('plots/images/figure3.png', dpi=300, bbox_inches='tight', facecolor='white')
-print("\nInequality time series plot saved to 'plots/images/figure3.png'")
-plt.close()
+    plot_inequality_types(fig.add_subplot(), type_percentages)
+    fig.tight_layout()
+    save_figure(fig, 'plots/images/figure4.png')
+    print("\nInequality types bar chart saved to 'plots/images/figure4.png'")
+    
+    # Create attractive standalone time series plot
+    print("\n" + "="*60)
+    print("CREATING INEQUALITY TIME SERIES PLOT")
+    print("="*60)
+    
+    fig.clear()
+    fig.set_size_inches(14, 7)
+    create_inequality_timeseries(monthly_master, fig.add_subplot())
+    fig.tight_layout()
+    save_figure(fig, 'plots/images/figure3.png')
+    print("\nInequality time series plot saved to 'plots/images/figure3.png'")
+    
+    plt.close(fig)
 
 # ============================================================================
 # MAP VISUALIZATION CODE (COMMENTED OUT - ONLY TIME SERIES PLOT IS USED)
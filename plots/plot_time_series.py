@@ -1,30 +1,181 @@
+import os
+import sys
+import functools
+import hashlib
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
+from matplotlib.colors import LinearSegmentedColormap
 
-df = pd.read_parquet('data/articles/lancet_europe_dataset_monthly.parquet')
+# visualize_article_map imports utils from the repository root
+if os.path.abspath('.') not in sys.path:
+    sys.path.insert(0, os.path.abspath('.'))
+from visualize_article_map import create_map, create_difference_map, _figure_is_current, SAVEFIG_DPI
+
+MONTHLY_PATH = 'data/articles/lancet_europe_dataset_monthly.parquet'
+GROUPED_CACHE_PATH = 'data/articles/lancet_europe_dataset_monthly_grouped.parquet'
+
+# Monthly count columns summed across countries
+COUNT_COLUMNS = ['article_count', 'climate', 'health', 'climate_health', 'urban', 'rural']
 
-df_grouped = df.groupby('month_year').agg({
-    'article_count': 'sum',
-    'climate': 'sum',
-    'health': 'sum',
-    'climate_health': 'sum',
-    'urban': 'sum',
-    'rural': 'sum'
-}).reset_index()
+# Map colormaps, built once: white to blue, and a diverging map with purple
+# for rural (negative), white for neutral and teal for urban (positive)
+_CMAP_BLUE = LinearSegmentedColormap.from_list('custom_blue', ['#ffffff', '#0072B2'])
+_CMAP_UR_DIFF = LinearSegmentedColormap.from_list('urban_rural_diff', ['#8e44ad', '#ffffff', '#16a085'])
 
-# Remove 2025-09 data point
-df_grouped = df_grouped[df_grouped['month_year'] != '2025-09']
+# Percentage columns shared by the plot functions: name -> (numerator, denominator)
+PERCENTAGE_COLUMNS = {
+    'climate_pct': ('climate', 'article_count'),
+    'health_pct': ('health', 'climate'),
+    'climate_health_pct': ('climate_health', 'climate'),
+    'urban_pct': ('urban', 'climate'),
+    'rural_pct': ('rural', 'climate'),
+    'urban_health_pct': ('urban', 'health'),
+    'rural_health_pct': ('rural', 'health'),
+}
 
 
-def plot_percentage_timeseries(df_grouped, variables, figsize=(12, 6), colors=None, title=None):
+def monthly_arrays(df_grouped):
     """
-    Plot variables as a percentage of article_count over time.
+    Extract the monthly columns into contiguous float32 arrays in one pass.
+    
+    The plot functions read these arrays directly instead of going through
+    DataFrame column access, and the percentage columns in PERCENTAGE_COLUMNS
+    are computed once here.
     
     Parameters:
     -----------
     df_grouped : pd.DataFrame
-        DataFrame with 'month_year', 'article_count', and variable columns
+        DataFrame with 'month_year' and the COUNT_COLUMNS columns
+    
+    Returns:
+    --------
+    monthly : dict
+        Column name -> np.ndarray, for 'month_year', COUNT_COLUMNS and the
+        PERCENTAGE_COLUMNS
+    """
+    monthly = {col: df_grouped[col].to_numpy(dtype=np.float32) for col in COUNT_COLUMNS}
+    monthly['month_year'] = df_grouped['month_year'].to_numpy(dtype=str)
+    for pct_col, (numerator, denominator) in PERCENTAGE_COLUMNS.items():
+        monthly[pct_col] = monthly[numerator] * (100.0 / monthly[denominator])
+    return monthly
+
+
+@functools.lru_cache(maxsize=1)
+def load_grouped():
+    """
+    Load monthly article counts summed across countries.
+    
+    The aggregation is cached next to the source parquet, tagged with the
+    source file's modification time, and only recomputed when the source
+    changes. Nothing is read until this is first called.
+    
+    Returns:
+    --------
+    monthly : dict
+        Monthly arrays from monthly_arrays(), shared by every plot function
+    """
+    src_mtime = str(os.path.getmtime(MONTHLY_PATH)).encode()
+    
+    if os.path.exists(GROUPED_CACHE_PATH):
+        cached = pq.read_table(GROUPED_CACHE_PATH)
+        if (cached.schema.metadata or {}).get(b'src_mtime') == src_mtime:
+            return monthly_arrays(cached.to_pandas())
+    
+    # Read only the columns we aggregate, dropping the incomplete 2025-09 month at read time
+    df = pd.read_parquet(
+        MONTHLY_PATH,
+        columns=['month_year'] + COUNT_COLUMNS,
+        filters=[('month_year', '!=', '2025-09')],
+        engine='pyarrow'
+    )
+    
+    # Work on categorical codes rather than hashing month strings, and on
+    # int32 counts (monthly article counts fit easily) to halve the bytes summed
+    df['month_year'] = df['month_year'].astype('category')
+    df[COUNT_COLUMNS] = df[COUNT_COLUMNS].astype(np.int32)
+    
+    # Sort rows by month code once, then sum each count column over the runs
+    # of equal months with np.add.reduceat (rows with a missing month are dropped)
+    codes, months = pd.factorize(df['month_year'], sort=True)
+    order = np.flatnonzero(codes >= 0)
+    order = order[np.argsort(codes[order], kind='stable')]
+    sorted_codes = codes[order]
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1))
+    
+    df_grouped = pd.DataFrame({
+        'month_year': months,
+        **{col: np.add.reduceat(df[col].to_numpy()[order], starts) for col in COUNT_COLUMNS}
+    })
+    
+    table = pa.Table.from_pandas(df_grouped, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'src_mtime': src_mtime})
+    pq.write_table(table, GROUPED_CACHE_PATH)
+    
+    return monthly_arrays(df_grouped)
+
+
+def _input_hash(monthly, df_country, gdf, figsize):
+    """
+    Hash the inputs of a combined map and time series figure.
+    
+    Parameters:
+    -----------
+    monthly : dict
+        Monthly time series arrays from load_grouped()
+    df_country : pd.DataFrame
+        DataFrame with country-level aggregated data
+    gdf : gpd.GeoDataFrame
+        GeoDataFrame with country geometries for mapping
+    figsize : tuple
+        Figure size (width, height); SAVEFIG_DPI is hashed along with it
+    
+    Returns:
+    --------
+    str
+        16 character hex digest
+    """
+    h = hashlib.blake2b(repr((figsize, SAVEFIG_DPI)).encode(), digest_size=8)
+    for key in sorted(monthly):
+        h.update(key.encode())
+        h.update(np.ascontiguousarray(monthly[key]).tobytes())
+    h.update(pd.util.hash_pandas_object(df_country, index=False).to_numpy().tobytes())
+    attributes = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    h.update(pd.util.hash_pandas_object(attributes, index=False).to_numpy().tobytes())
+    h.update(b''.join(gdf.geometry.to_wkb()))
+    return h.hexdigest()
+
+
+def _style(ax):
+    """Remove gridlines and show only the left and bottom spines."""
+    ax.grid(False)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_linewidth(1.5)
+    ax.spines['bottom'].set_linewidth(1.5)
+
+
+def _month_ticks(ax, month_year):
+    """Label the x-axis with about 15 rotated month labels."""
+    n_labels = len(month_year)
+    step = n_labels // 15 if n_labels > 20 else 1
+    ax.set_xticks(np.arange(0, n_labels, step), labels=month_year[::step],
+                  rotation=45, ha='right')
+
+
+def plot_percentage_timeseries(monthly, variables, figsize=(12, 6), colors=None, title=None):
+    """
+    Plot variables as a percentage of article_count over time.
+    
+    Parameters:
+    -----------
+    monthly : dict
+        Monthly arrays from load_grouped(), with 'month_year', 'article_count' and the variable columns
     variables : list
         List of column names to plot as percentages
     figsize : tuple, optional
@@ -38,13 +189,13 @@ def plot_percentage_timeseries(df_grouped, variables, figsize=(12, 6), colors=No
     --------
     fig, ax : matplotlib figure and axis objects
     """
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    for var in variables:
-        df_plot[f'{var}_pct'] = (df_plot[var] / df_plot['article_count']) * 100
+    # Calculate percentages on plain arrays
+    month_year = monthly['month_year']
+    article_count = monthly['article_count']
+    pcts = {var: monthly[var] * (100.0 / article_count) for var in variables}
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    # Create figure; constrained layout prevents label cutoff during the normal draw
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Plot each variable
     if colors is None:
@@ -52,7 +203,7 @@ def plot_percentage_timeseries(df_grouped, variables, figsize=(12, 6), colors=No
     
     for i, var in enumerate(variables):
         color = colors[i % len(colors)]
-        ax.plot(df_plot['month_year'], df_plot[f'{var}_pct'], 
+        ax.plot(month_year, pcts[var], 
                 marker='o', linewidth=2, markersize=4, 
                 label=var.replace('_', ' ').title(), color=color)
     
@@ -64,37 +215,19 @@ def plot_percentage_timeseries(df_grouped, variables, figsize=(12, 6), colors=No
         title = 'Article Distribution Over Time'
     ax.set_title(title, fontsize=13, fontweight='bold', pad=20)
     
-    # Remove gridlines
-    ax.grid(False)
-    
-    # Only show spines on left and bottom
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
+    # No gridlines, only left and bottom spines
+    _style(ax)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        # Show every nth label
-        step = n_labels // 15  # Show approximately 15 labels
-        tick_positions = range(0, n_labels, step)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    
-    # Rotate labels for better readability
-    plt.xticks(rotation=45, ha='right')
+    _month_ticks(ax, month_year)
     
     # Add legend
     ax.legend(frameon=False, loc='best', fontsize=10)
     
-    # Tight layout to prevent label cutoff
-    plt.tight_layout()
-    
     return fig, ax
 
 
-def plot_climate_health_subplots(df_grouped, figsize=(12, 10), title=None):
+def plot_climate_health_subplots(monthly, figsize=(12, 10), title=None):
     """
     Plot two stacked subplots:
     - Top: Climate as % of all articles (line)
@@ -102,8 +235,9 @@ def plot_climate_health_subplots(df_grouped, figsize=(12, 10), title=None):
     
     Parameters:
     -----------
-    df_grouped : pd.DataFrame
-        DataFrame with 'month_year', 'article_count', 'climate', 'health', and 'climate_health' columns
+    monthly : dict
+        Monthly arrays from load_grouped(), with 'month_year' and the
+        'climate_pct', 'health_pct' and 'climate_health_pct' arrays
     figsize : tuple, optional
         Figure size (width, height)
     title : str, optional
@@ -113,21 +247,21 @@ def plot_climate_health_subplots(df_grouped, figsize=(12, 10), title=None):
     --------
     fig, (ax1, ax2) : matplotlib figure and axis objects
     """
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    df_plot['climate_pct'] = (df_plot['climate'] / df_plot['article_count']) * 100
-    df_plot['health_pct'] = (df_plot['health'] / df_plot['climate']) * 100
-    df_plot['climate_health_pct'] = (df_plot['climate_health'] / df_plot['climate']) * 100
+    # Percentages precomputed by monthly_arrays
+    month_year = monthly['month_year']
+    climate_pct = monthly['climate_pct']
+    health_pct = monthly['health_pct']
+    climate_health_pct = monthly['climate_health_pct']
     
     # Create figure with two subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, sharex=True)
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=figsize, sharex=True, layout='constrained')
     
     # Create x-axis positions (numeric for area plot)
-    x = range(len(df_plot))
+    x = range(len(month_year))
     
     # TOP PLOT: Climate as % of all articles
     color_climate = '#414a4c'
-    ax1.plot(x, df_plot['climate_pct'], 
+    ax1.plot(x, climate_pct, 
              color=color_climate, linewidth=2.5, marker='o', markersize=5,
              label='Climate Articles')
     
@@ -135,66 +269,46 @@ def plot_climate_health_subplots(df_grouped, figsize=(12, 10), title=None):
     ax1.set_title('Climate Coverage', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for top plot
-    ax1.grid(False)
-    ax1.spines['top'].set_visible(False)
-    ax1.spines['right'].set_visible(False)
-    ax1.spines['left'].set_linewidth(1.5)
-    ax1.spines['bottom'].set_linewidth(1.5)
+    _style(ax1)
     
     # BOTTOM PLOT: Health topics as % of climate articles (area plots)
-    ax2.fill_between(x, 0, df_plot['health_pct'], 
+    ax2.fill_between(x, 0, health_pct, 
                      color='#66c2a5', alpha=0.6,
                      label='Health (any mention)')
-    ax2.fill_between(x, 0, df_plot['climate_health_pct'], 
+    ax2.fill_between(x, 0, climate_health_pct, 
                      color='#fc8d62', alpha=0.6,
                      label='Health (climate connection)')
     
     # Add line borders for area plots
-    ax2.plot(x, df_plot['health_pct'], color='#66c2a5', linewidth=2)
-    ax2.plot(x, df_plot['climate_health_pct'], color='#fc8d62', linewidth=2)
+    ax2.plot(x, health_pct, color='#66c2a5', linewidth=2)
+    ax2.plot(x, climate_health_pct, color='#fc8d62', linewidth=2)
     
     ax2.set_xlabel('Month', fontsize=11, fontweight='bold')
     ax2.set_ylabel('% of Climate Articles', fontsize=11, fontweight='bold')
     ax2.set_title('Health Topics Within Climate Coverage', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for bottom plot
-    ax2.grid(False)
-    ax2.spines['top'].set_visible(False)
-    ax2.spines['right'].set_visible(False)
-    ax2.spines['left'].set_linewidth(1.5)
-    ax2.spines['bottom'].set_linewidth(1.5)
+    _style(ax2)
     ax2.legend(frameon=False, loc='best', fontsize=10)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        step = n_labels // 15
-        tick_positions = range(0, n_labels, step)
-        ax2.set_xticks(tick_positions)
-        ax2.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    else:
-        ax2.set_xticks(x)
-        ax2.set_xticklabels(df_plot['month_year'])
-    
-    plt.xticks(rotation=45, ha='right')
+    _month_ticks(ax2, month_year)
     
     # Overall title if provided
     if title:
-        fig.suptitle(title, fontsize=14, fontweight='bold', y=0.995)
-    
-    plt.tight_layout()
+        fig.suptitle(title, fontsize=14, fontweight='bold')
     
     return fig, (ax1, ax2)
 
 
-def plot_urban_rural(df_grouped, figsize=(12, 6), title=None):
+def plot_urban_rural(monthly, figsize=(12, 6), title=None):
     """
     Plot urban and rural as % of climate articles (line plot).
     
     Parameters:
     -----------
-    df_grouped : pd.DataFrame
-        DataFrame with 'month_year', 'climate', 'urban', and 'rural' columns
+    monthly : dict
+        Monthly arrays from load_grouped(), with 'month_year', 'urban_pct' and 'rural_pct' arrays
     figsize : tuple, optional
         Figure size (width, height)
     title : str, optional
@@ -204,22 +318,22 @@ def plot_urban_rural(df_grouped, figsize=(12, 6), title=None):
     --------
     fig, ax : matplotlib figure and axis objects
     """
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    df_plot['urban_pct'] = (df_plot['urban'] / df_plot['climate']) * 100
-    df_plot['rural_pct'] = (df_plot['rural'] / df_plot['climate']) * 100
+    # Percentages precomputed by monthly_arrays
+    month_year = monthly['month_year']
+    urban_pct = monthly['urban_pct']
+    rural_pct = monthly['rural_pct']
     
-    # Create figure
-    fig, ax = plt.subplots(figsize=figsize)
+    # Create figure; constrained layout prevents label cutoff during the normal draw
+    fig, ax = plt.subplots(figsize=figsize, layout='constrained')
     
     # Create x-axis positions
-    x = range(len(df_plot))
+    x = range(len(month_year))
     
     # Plot urban and rural lines
-    ax.plot(x, df_plot['urban_pct'], 
+    ax.plot(x, urban_pct, 
             color='#8da0cb', linewidth=2.5, marker='o', markersize=5,
             label='Urban')
-    ax.plot(x, df_plot['rural_pct'], 
+    ax.plot(x, rural_pct, 
             color='#e78ac3', linewidth=2.5, marker='o', markersize=5,
             label='Rural')
     
@@ -231,39 +345,19 @@ def plot_urban_rural(df_grouped, figsize=(12, 6), title=None):
         title = 'Urban and Rural Topics Within Climate Coverage'
     ax.set_title(title, fontsize=13, fontweight='bold', pad=20)
     
-    # Remove gridlines
-    ax.grid(False)
-    
-    # Only show spines on left and bottom
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
+    # No gridlines, only left and bottom spines
+    _style(ax)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        step = n_labels // 15
-        tick_positions = range(0, n_labels, step)
-        ax.set_xticks(tick_positions)
-        ax.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    else:
-        ax.set_xticks(x)
-        ax.set_xticklabels(df_plot['month_year'])
-    
-    # Rotate labels for better readability
-    plt.xticks(rotation=45, ha='right')
+    _month_ticks(ax, month_year)
     
     # Add legend
     ax.legend(frameon=False, loc='best', fontsize=10)
     
-    # Tight layout to prevent label cutoff
-    plt.tight_layout()
-    
     return fig, ax
 
 
-def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24, 14)):
+def plot_combined_maps_and_timeseries(monthly, df_country, gdf, figsize=(24, 14)):
     """
     Create a combined figure with maps on left and time series plots on right.
     
@@ -273,8 +367,8 @@ def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24,
     
     Parameters:
     -----------
-    df_grouped : pd.DataFrame
-        DataFrame with monthly time series data
+    monthly : dict
+        Monthly time series arrays from load_grouped()
     df_country : pd.DataFrame
         DataFrame with country-level aggregated data
     gdf : gpd.GeoDataFrame
@@ -284,22 +378,17 @@ def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24,
     
     Returns:
     --------
-    fig : matplotlib figure object
+    fig : matplotlib figure object, or None if the saved figure is already up to date
     """
-    # Import necessary functions from visualize_article_map
-    import sys
-    import os
-    sys.path.insert(0, os.path.abspath('.'))
-    from visualize_article_map import create_map
-    import numpy as np
-    from matplotlib.colors import LinearSegmentedColormap
+    # Skip rendering when the saved figure was made from the same inputs
+    output_file = 'plots/images/figure1.png'
+    input_hash = _input_hash(monthly, df_country, gdf, figsize)
+    if _figure_is_current(output_file, input_hash):
+        print(f"\n{output_file} is up to date, skipping")
+        return None
     
     print("\nCreating combined maps and time series visualization...")
     
-    # Create custom colormap using blue
-    colors_blue = ['#ffffff', '#0072B2']
-    cmap_blue = LinearSegmentedColormap.from_list('custom_blue', colors_blue)
-    
     # Create figure with custom grid
     fig = plt.figure(figsize=figsize)
     gs = gridspec.GridSpec(2, 2, figure=fig, width_ratios=[1, 1], height_ratios=[1, 1], hspace=0.15, wspace=0.15)
@@ -320,7 +409,7 @@ def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24,
         denominator_col='article_count',
         ax=ax_map1,
         title='Climate Coverage\n(% of All Articles)',
-        cmap=cmap_blue,
+        cmap=_CMAP_BLUE,
         show_percentage=True
     )
     
@@ -331,24 +420,24 @@ def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24,
         denominator_col='climate',
         ax=ax_map2,
         title='Health Topics Within Climate Coverage\n(% of Climate Articles)',
-        cmap=cmap_blue,
+        cmap=_CMAP_BLUE,
         show_percentage=True
     )
     
     # === CREATE TIME SERIES PLOTS ===
     print("\n--- TIME SERIES PLOTS ---")
     
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    df_plot['climate_pct'] = (df_plot['climate'] / df_plot['article_count']) * 100
-    df_plot['health_pct'] = (df_plot['health'] / df_plot['climate']) * 100
-    df_plot['climate_health_pct'] = (df_plot['climate_health'] / df_plot['climate']) * 100
+    # Percentages precomputed by monthly_arrays
+    month_year = monthly['month_year']
+    climate_pct = monthly['climate_pct']
+    health_pct = monthly['health_pct']
+    climate_health_pct = monthly['climate_health_pct']
     
     # Create x-axis positions
-    x = range(len(df_plot))
+    x = range(len(month_year))
     
     # TIME SERIES 1: Climate as % of all articles
-    ax_ts1.plot(x, df_plot['climate_pct'], 
+    ax_ts1.plot(x, climate_pct, 
                 marker='o', linewidth=3.5, markersize=8, color='#999999',
                 markerfacecolor='#0072B2', markeredgecolor='white', markeredgewidth=1.5,
                 label='Climate Articles')
@@ -357,63 +446,44 @@ def plot_combined_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(24,
     ax_ts1.set_title('Climate Coverage Over Time', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for first time series
-    ax_ts1.grid(False)
-    ax_ts1.spines['top'].set_visible(False)
-    ax_ts1.spines['right'].set_visible(False)
-    ax_ts1.spines['left'].set_linewidth(1.5)
-    ax_ts1.spines['bottom'].set_linewidth(1.5)
+    _style(ax_ts1)
     
     # Hide x-axis labels on top plot (since bottom plot shares x-axis)
     plt.setp(ax_ts1.xaxis.get_majorticklabels(), visible=False)
     
     # TIME SERIES 2: Health topics as % of climate articles (area plots)
-    ax_ts2.fill_between(x, 0, df_plot['health_pct'], 
+    ax_ts2.fill_between(x, 0, health_pct, 
                         color='#0072B2', alpha=0.6,
                         label='Health (any mention)')
-    ax_ts2.fill_between(x, 0, df_plot['climate_health_pct'], 
+    ax_ts2.fill_between(x, 0, climate_health_pct, 
                         color='#E69F00', alpha=0.85,
                         label='Health (climate connection)')
     
     # Add line borders for area plots
-    ax_ts2.plot(x, df_plot['health_pct'], color='#0072B2', linewidth=2)
-    ax_ts2.plot(x, df_plot['climate_health_pct'], color='#E69F00', linewidth=2)
+    ax_ts2.plot(x, health_pct, color='#0072B2', linewidth=2)
+    ax_ts2.plot(x, climate_health_pct, color='#E69F00', linewidth=2)
     
     ax_ts2.set_xlabel('Month', fontsize=11, fontweight='bold')
     ax_ts2.set_ylabel('% of Climate Articles', fontsize=11, fontweight='bold')
     ax_ts2.set_title('Health Topics Within Climate Coverage Over Time', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for second time series
-    ax_ts2.grid(False)
-    ax_ts2.spines['top'].set_visible(False)
-    ax_ts2.spines['right'].set_visible(False)
-    ax_ts2.spines['left'].set_linewidth(1.5)
-    ax_ts2.spines['bottom'].set_linewidth(1.5)
+    _style(ax_ts2)
     ax_ts2.legend(frameon=False, loc='best', fontsize=10)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        step = n_labels // 15
-        tick_positions = range(0, n_labels, step)
-        ax_ts2.set_xticks(tick_positions)
-        ax_ts2.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    else:
-        ax_ts2.set_xticks(x)
-        ax_ts2.set_xticklabels(df_plot['month_year'])
-    
-    plt.setp(ax_ts2.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    _month_ticks(ax_ts2, month_year)
     
     # Save the combined figure
-    import os
     os.makedirs('plots/images', exist_ok=True)
-    output_file = 'plots/images/figure1.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                metadata={'InputHash': input_hash})
     print(f"\nCombined visualization saved to: {output_file}")
     
     return fig
 
 
-def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(12, 14)):
+def plot_urban_rural_maps_and_timeseries(monthly, df_country, gdf, figsize=(12, 14)):
     """
     Create a combined figure with time series on top and difference map on bottom.
     
@@ -423,8 +493,8 @@ def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(1
     
     Parameters:
     -----------
-    df_grouped : pd.DataFrame
-        DataFrame with monthly time series data
+    monthly : dict
+        Monthly time series arrays from load_grouped()
     df_country : pd.DataFrame
         DataFrame with country-level aggregated data
     gdf : gpd.GeoDataFrame
@@ -434,23 +504,17 @@ def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(1
     
     Returns:
     --------
-    fig : matplotlib figure object
+    fig : matplotlib figure object, or None if the saved figure is already up to date
     """
-    # Import necessary functions
-    import sys
-    import os
-    sys.path.insert(0, os.path.abspath('.'))
-    from visualize_article_map import create_difference_map
-    import numpy as np
-    from matplotlib.colors import LinearSegmentedColormap
+    # Skip rendering when the saved figure was made from the same inputs
+    output_file = 'plots/images/urban_rural_maps_timeseries.png'
+    input_hash = _input_hash(monthly, df_country, gdf, figsize)
+    if _figure_is_current(output_file, input_hash):
+        print(f"\n{output_file} is up to date, skipping")
+        return None
     
     print("\nCreating urban/rural maps and time series visualization...")
     
-    # Create custom diverging colormap for difference map
-    # Purple for rural (negative), white for neutral, teal for urban (positive)
-    colors_diverging = ['#8e44ad', '#ffffff', '#16a085']
-    cmap_diverging = LinearSegmentedColormap.from_list('urban_rural_diff', colors_diverging)
-    
     # Create figure with custom grid
     fig = plt.figure(figsize=figsize)
     gs = gridspec.GridSpec(2, 1, figure=fig, height_ratios=[1, 1.2], hspace=0.35)
@@ -464,19 +528,19 @@ def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(1
     # === CREATE TIME SERIES PLOT ===
     print("\n--- TIME SERIES: Urban and Rural in Climate Coverage ---")
     
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    df_plot['urban_climate_pct'] = (df_plot['urban'] / df_plot['climate']) * 100
-    df_plot['rural_climate_pct'] = (df_plot['rural'] / df_plot['climate']) * 100
+    # Percentages precomputed by monthly_arrays
+    month_year = monthly['month_year']
+    urban_climate_pct = monthly['urban_pct']
+    rural_climate_pct = monthly['rural_pct']
     
     # Create x-axis positions
-    x = range(len(df_plot))
+    x = range(len(month_year))
     
     # Plot urban and rural lines
-    ax_ts.plot(x, df_plot['urban_climate_pct'], 
+    ax_ts.plot(x, urban_climate_pct, 
                color='#16a085', linewidth=2.5, marker='o', markersize=5,
                label='Urban')
-    ax_ts.plot(x, df_plot['rural_climate_pct'], 
+    ax_ts.plot(x, rural_climate_pct, 
                color='#8e44ad', linewidth=2.5, marker='o', markersize=5,
                label='Rural')
     
@@ -485,25 +549,11 @@ def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(1
     ax_ts.set_title('Urban and Rural in Climate Coverage Over Time', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for time series
-    ax_ts.grid(False)
-    ax_ts.spines['top'].set_visible(False)
-    ax_ts.spines['right'].set_visible(False)
-    ax_ts.spines['left'].set_linewidth(1.5)
-    ax_ts.spines['bottom'].set_linewidth(1.5)
+    _style(ax_ts)
     ax_ts.legend(frameon=False, loc='best', fontsize=10)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        step = n_labels // 15
-        tick_positions = range(0, n_labels, step)
-        ax_ts.set_xticks(tick_positions)
-        ax_ts.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    else:
-        ax_ts.set_xticks(x)
-        ax_ts.set_xticklabels(df_plot['month_year'])
-    
-    plt.setp(ax_ts.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    _month_ticks(ax_ts, month_year)
     
     # === CREATE DIFFERENCE MAP ===
     print("\n--- MAP: Urban - Rural (% of Climate) ---")
@@ -514,20 +564,19 @@ def plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(1
         denominator_col='climate',
         ax=ax_map,
         title='Urban - Rural in Climate Coverage\n(% of Climate Articles)',
-        cmap=cmap_diverging
+        cmap=_CMAP_UR_DIFF
     )
     
     # Save the combined figure
-    import os
     os.makedirs('plots/images', exist_ok=True)
-    output_file = 'plots/images/urban_rural_maps_timeseries.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                metadata={'InputHash': input_hash})
     print(f"\nUrban/Rural visualization saved to: {output_file}")
     
     return fig
 
 
-def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country, gdf, figsize=(12, 14)):
+def plot_urban_rural_climate_health_maps_and_timeseries(monthly, df_country, gdf, figsize=(12, 14)):
     """
     Create a combined figure with time series on top and difference map on bottom.
     Focuses on urban/rural in health articles (which mention both climate and health).
@@ -538,8 +587,8 @@ def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country,
     
     Parameters:
     -----------
-    df_grouped : pd.DataFrame
-        DataFrame with monthly time series data
+    monthly : dict
+        Monthly time series arrays from load_grouped()
     df_country : pd.DataFrame
         DataFrame with country-level aggregated data
     gdf : gpd.GeoDataFrame
@@ -549,23 +598,17 @@ def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country,
     
     Returns:
     --------
-    fig : matplotlib figure object
+    fig : matplotlib figure object, or None if the saved figure is already up to date
     """
-    # Import necessary functions
-    import sys
-    import os
-    sys.path.insert(0, os.path.abspath('.'))
-    from visualize_article_map import create_difference_map
-    import numpy as np
-    from matplotlib.colors import LinearSegmentedColormap
+    # Skip rendering when the saved figure was made from the same inputs
+    output_file = 'plots/images/urban_rural_climate_health_maps_timeseries.png'
+    input_hash = _input_hash(monthly, df_country, gdf, figsize)
+    if _figure_is_current(output_file, input_hash):
+        print(f"\n{output_file} is up to date, skipping")
+        return None
     
     print("\nCreating urban/rural maps and time series visualization for climate-health stories...")
     
-    # Create custom diverging colormap for difference map
-    # Purple for rural (negative), white for neutral, teal for urban (positive)
-    colors_diverging = ['#8e44ad', '#ffffff', '#16a085']
-    cmap_diverging = LinearSegmentedColormap.from_list('urban_rural_diff', colors_diverging)
-    
     # Create figure with custom grid
     fig = plt.figure(figsize=figsize)
     gs = gridspec.GridSpec(2, 1, figure=fig, height_ratios=[1, 1.2], hspace=0.35)
@@ -579,19 +622,19 @@ def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country,
     # === CREATE TIME SERIES PLOT ===
     print("\n--- TIME SERIES: Urban and Rural in Health Articles ---")
     
-    # Calculate percentages
-    df_plot = df_grouped.copy()
-    df_plot['urban_health_pct'] = (df_plot['urban'] / df_plot['health']) * 100
-    df_plot['rural_health_pct'] = (df_plot['rural'] / df_plot['health']) * 100
+    # Percentages precomputed by monthly_arrays
+    month_year = monthly['month_year']
+    urban_health_pct = monthly['urban_health_pct']
+    rural_health_pct = monthly['rural_health_pct']
     
     # Create x-axis positions
-    x = range(len(df_plot))
+    x = range(len(month_year))
     
     # Plot urban and rural lines
-    ax_ts.plot(x, df_plot['urban_health_pct'], 
+    ax_ts.plot(x, urban_health_pct, 
                color='#16a085', linewidth=2.5, marker='o', markersize=5,
                label='Urban')
-    ax_ts.plot(x, df_plot['rural_health_pct'], 
+    ax_ts.plot(x, rural_health_pct, 
                color='#8e44ad', linewidth=2.5, marker='o', markersize=5,
                label='Rural')
     
@@ -600,25 +643,11 @@ def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country,
     ax_ts.set_title('Urban and Rural in Health Articles Over Time', fontsize=12, fontweight='bold', pad=10)
     
     # Styling for time series
-    ax_ts.grid(False)
-    ax_ts.spines['top'].set_visible(False)
-    ax_ts.spines['right'].set_visible(False)
-    ax_ts.spines['left'].set_linewidth(1.5)
-    ax_ts.spines['bottom'].set_linewidth(1.5)
+    _style(ax_ts)
     ax_ts.legend(frameon=False, loc='best', fontsize=10)
     
     # Format x-axis to prevent label overlap
-    n_labels = len(df_plot)
-    if n_labels > 20:
-        step = n_labels // 15
-        tick_positions = range(0, n_labels, step)
-        ax_ts.set_xticks(tick_positions)
-        ax_ts.set_xticklabels([df_plot['month_year'].iloc[i] for i in tick_positions])
-    else:
-        ax_ts.set_xticks(x)
-        ax_ts.set_xticklabels(df_plot['month_year'])
-    
-    plt.setp(ax_ts.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    _month_ticks(ax_ts, month_year)
     
     # === CREATE DIFFERENCE MAP ===
     print("\n--- MAP: Urban - Rural (% of Health Articles) ---")
@@ -629,36 +658,37 @@ def plot_urban_rural_climate_health_maps_and_timeseries(df_grouped, df_country,
         denominator_col='health',
         ax=ax_map,
         title='Urban - Rural in Health Articles\n(% of Health Articles)',
-        cmap=cmap_diverging
+        cmap=_CMAP_UR_DIFF
     )
     
     # Save the combined figure
-    import os
     os.makedirs('plots/images', exist_ok=True)
-    output_file = 'plots/images/urban_rural_climate_health_maps_timeseries.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                metadata={'InputHash': input_hash})
     print(f"\nUrban/Rural visualization saved to: {output_file}")
     
     return fig
 
 
 # Example usage:
+# monthly = load_grouped()
+#
 # Single plots:
-# fig, (ax1, ax2) = plot_climate_health_subplots(df_grouped)
+# fig, (ax1, ax2) = plot_climate_health_subplots(monthly)
 # plt.show()
 
 # For urban/rural plot:
-# fig_ur, ax_ur = plot_urban_rural(df_grouped)
+# fig_ur, ax_ur = plot_urban_rural(monthly)
 # plt.show()
 
 # For combined maps and time series (maps on left, time series on right):
-# from visualize_article_map import load_shapefile, df_country
+# from visualize_article_map import load_shapefile, load_country_df
 # gdf = load_shapefile()
-# fig = plot_combined_maps_and_timeseries(df_grouped, df_country, gdf)
+# fig = plot_combined_maps_and_timeseries(monthly, load_country_df(), gdf)
 # plt.show()
 
 # For urban/rural analysis (difference maps on left, time series on right):
-# from visualize_article_map import load_shapefile, df_country
+# from visualize_article_map import load_shapefile, load_country_df
 # gdf = load_shapefile()
-# fig = plot_urban_rural_maps_and_timeseries(df_grouped, df_country, gdf)
+# fig = plot_urban_rural_maps_and_timeseries(monthly, load_country_df(), gdf)
 # plt.show()
\ No newline at end of file
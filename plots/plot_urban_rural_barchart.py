@@ -8,16 +8,162 @@ This script creates a bar chart showing:
 
 import sys
 import os
-import pandas as pd
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import numpy as np
 from scipy import stats
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from load_articles import load_articles, DATASET_PATH, HEALTH_SUBSET_PATH
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# urban_rural_framing of the climate articles without health, derived from DATASET_PATH
+NO_HEALTH_CACHE_PATH = 'data/articles/lancet_europe_dataset_no_health_framing.parquet'
+
+
+# load_articles caches the decoded Arrow tables, so each file is read once per process;
+# urban_rural_framing has four values and stays dictionary-encoded as a category
+def _load_climate_all():
+    """Load urban_rural_framing and health for all climate articles."""
+    return load_articles(DATASET_PATH, columns=['urban_rural_framing', 'health'],
+                         categories=['urban_rural_framing'])
+
+
+def _load_health():
+    """Load urban_rural_framing for the climate & health subset."""
+    return load_articles(HEALTH_SUBSET_PATH, columns=['urban_rural_framing'],
+                         categories=['urban_rural_framing'])
+
+
+def _no_health_framing():
+    """
+    Load urban_rural_framing for the climate articles without health (health != 1).
+    
+    The filtered column is cached in NO_HEALTH_CACHE_PATH, tagged with the source
+    file's modification time, and only recomputed when the source changes.
+    
+    Returns:
+    --------
+    pd.Series
+        Categorical urban_rural_framing of the climate articles without health
+    """
+    src_mtime = str(os.path.getmtime(DATASET_PATH)).encode()
+    
+    if os.path.exists(NO_HEALTH_CACHE_PATH):
+        cached = pq.read_table(NO_HEALTH_CACHE_PATH, read_dictionary=['urban_rural_framing'])
+        if (cached.schema.metadata or {}).get(b'src_mtime') == src_mtime:
+            return cached.column('urban_rural_framing').to_pandas()
+    
+    df_climate_all = _load_climate_all()
+    # Build a plain bool mask with Arrow kernels straight from the health buffer
+    # (missing health counts as no health) and keep only the framing column. Arrow has
+    # no equal(bool, int) kernel, so health is cast to float64 first, which like
+    # pandas' == 1 accepts bool, int and float columns
+    health = pc.cast(pa.array(df_climate_all['health']), pa.float64())
+    is_health = pc.fill_null(pc.equal(health, 1.0), False)
+    mask = np.asarray(pc.invert(is_health))
+    framing = df_climate_all['urban_rural_framing'][mask]
+    
+    table = pa.table({'urban_rural_framing': pa.array(framing)})
+    table = table.replace_schema_metadata({b'src_mtime': src_mtime})
+    pq.write_table(table, NO_HEALTH_CACHE_PATH, compression='zstd')
+    
+    return framing
+
+
+def _framing_counts(framing):
+    """
+    Count each urban_rural_framing category with a single bincount over the
+    category codes, skipping missing values.
+    
+    Parameters:
+    -----------
+    framing : pd.Series
+        Categorical urban_rural_framing column
+    
+    Returns:
+    --------
+    dict
+        Category -> number of articles
+    """
+    codes = framing.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(framing.cat.categories))
+    return dict(zip(framing.cat.categories, counts))
+
+
+def _plot_framing_bars(values_a, values_b, label_a, label_b, output_file, figsize):
+    """
+    Draw and save a grouped bar chart of two framing distributions.
+    
+    Parameters:
+    -----------
+    values_a, values_b : list
+        Percentages for 'neither', 'urban', 'rural' and 'both'
+    label_a, label_b : str
+        Legend labels for the two groups
+    output_file : str
+        Path of the PNG to write
+    figsize : tuple
+        Figure size (width, height)
+    
+    Returns:
+    --------
+    fig, ax : matplotlib figure and axis objects
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+    
+    x = np.arange(len(values_a))
+    width = 0.35
+    gap = 0.05  # Small gap between bars
+    
+    # Create bars with borders and transparency for visual depth
+    bars1 = ax.bar(x - width/2 - gap/2, values_a, width, label=label_a, 
+                   color='#0072B2', alpha=0.7, edgecolor='#0072B2', linewidth=2)
+    bars2 = ax.bar(x + width/2 + gap/2, values_b, width, label=label_b, 
+                   color='#E69F00', alpha=0.7, edgecolor='#E69F00', linewidth=2)
+    
+    # Customize chart
+    ax.set_xlabel('Urban/Rural Framing', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Percentage of Articles (%)', fontsize=12, fontweight='bold')
+    #ax.set_title('', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xticks(x)
+    
+    # Custom descriptive labels for display
+    category_labels = ['Neither', 'Urban only', 'Rural only', 'Both urban and rural']
+    ax.set_xticklabels(category_labels)
+    
+    # Add legend
+    ax.legend(frameon=False, fontsize=11, loc='upper right')
+    
+    # Styling
+    ax.grid(False)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_linewidth(1.5)
+    ax.spines['bottom'].set_linewidth(1.5)
+    
+    # Add value labels on top of bars
+    for bars in [bars1, bars2]:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                   f'{height:.1f}%',
+                   ha='center', va='bottom', fontsize=9)
+    
+    fig.tight_layout()
+    
+    # Save figure, cropped to its contents so long or rotated labels are never clipped
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    fig.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    print(f"\nBar chart saved to: {output_file}")
+    
+    return fig, ax
+
+
 def create_urban_rural_barchart(figsize=(10, 6)):
     """
     Create a grouped bar chart comparing urban/rural framing distribution
@@ -36,24 +182,24 @@ def create_urban_rural_barchart(figsize=(10, 6)):
     print("Creating Urban/Rural Framing Distribution Bar Chart (All vs Health)")
     print("=" * 70)
     
+    # Article totals come from the parquet footers, before any column is decoded
+    climate_total = pq.read_metadata(DATASET_PATH).num_rows
+    health_total = pq.read_metadata(HEALTH_SUBSET_PATH).num_rows
+    
+    print(f"Climate articles total: {climate_total}")
+    print(f"Health articles total: {health_total}")
+    
     # Load raw datasets to get urban_rural_framing column with all categories
     print("\nLoading datasets...")
-    # Load only the column we need to save memory
-    df_climate = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet', 
-                                  columns=['urban_rural_framing'])
-    df_health = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet', 
-                                 columns=['urban_rural_framing'])
-    
-    print(f"Climate articles total: {len(df_climate)}")
-    print(f"Health articles total: {len(df_health)}")
+    # The shared climate load also carries 'health'; only the framing column is used here
+    df_climate = _load_climate_all()[['urban_rural_framing']]
+    df_health = _load_health()
     
     # Count urban_rural_framing categories for climate articles
-    climate_counts = df_climate['urban_rural_framing'].value_counts()
-    climate_total = len(df_climate)
+    climate_counts = _framing_counts(df_climate['urban_rural_framing'])
     
     # Count urban_rural_framing categories for health articles
-    health_counts = df_health['urban_rural_framing'].value_counts()
-    health_total = len(df_health)
+    health_counts = _framing_counts(df_health['urban_rural_framing'])
     
     # Calculate percentages for all categories
     climate_pct = {
@@ -85,56 +231,10 @@ def create_urban_rural_barchart(figsize=(10, 6)):
     climate_values = [climate_pct[cat] for cat in categories]
     health_values = [health_pct[cat] for cat in categories]
     
-    # Create bar chart
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    x = np.arange(len(categories))
-    width = 0.35
-    gap = 0.05  # Small gap between bars
-    
-    # Create bars with borders and transparency for visual depth
-    bars1 = ax.bar(x - width/2 - gap/2, climate_values, width, label='All Climate Articles', 
-                   color='#0072B2', alpha=0.7, edgecolor='#0072B2', linewidth=2)
-    bars2 = ax.bar(x + width/2 + gap/2, health_values, width, label='Climate & Health Articles', 
-                   color='#E69F00', alpha=0.7, edgecolor='#E69F00', linewidth=2)
-    
-    # Customize chart
-    ax.set_xlabel('Urban/Rural Framing', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Percentage of Articles (%)', fontsize=12, fontweight='bold')
-    #ax.set_title('', fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(x)
-    
-    # Custom descriptive labels for display
-    category_labels = ['Neither', 'Urban only', 'Rural only', 'Both urban and rural']
-    ax.set_xticklabels(category_labels)
-    
-    # Add legend
-    ax.legend(frameon=False, fontsize=11, loc='upper right')
-    
-    # Styling
-    ax.grid(False)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
-    
-    # Add value labels on top of bars
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}%',
-                   ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    
-    # Save figure
-    os.makedirs('plots/images', exist_ok=True)
-    output_file = 'plots/images/figure2_alt.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"\nBar chart saved to: {output_file}")
-    
-    return fig, ax
+    # Create and save bar chart
+    return _plot_framing_bars(climate_values, health_values,
+                              'All Climate Articles', 'Climate & Health Articles',
+                              'plots/images/figure2_alt.png', figsize)
 
 
 def create_urban_rural_barchart_no_health_vs_health(figsize=(10, 6)):
@@ -157,24 +257,19 @@ def create_urban_rural_barchart_no_health_vs_health(figsize=(10, 6)):
     
     # Load raw datasets
     print("\nLoading datasets...")
-    # Load climate dataset with both urban_rural_framing and health columns
-    df_climate_all = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet', 
-                                      columns=['urban_rural_framing', 'health'])
-    df_health = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet', 
-                                 columns=['urban_rural_framing'])
-    
-    # Filter climate articles to get only those WITHOUT health (health != 1)
-    df_climate_no_health = df_climate_all[df_climate_all['health'] != 1]
+    # Framing of climate articles WITHOUT health (health != 1)
+    framing_no_health = _no_health_framing()
+    df_health = _load_health()
     
-    print(f"Climate articles without health: {len(df_climate_no_health)}")
+    print(f"Climate articles without health: {len(framing_no_health)}")
     print(f"Climate articles with health: {len(df_health)}")
     
     # Count urban_rural_framing categories for climate articles without health
-    no_health_counts = df_climate_no_health['urban_rural_framing'].value_counts()
-    no_health_total = len(df_climate_no_health)
+    no_health_counts = _framing_counts(framing_no_health)
+    no_health_total = len(framing_no_health)
     
     # Count urban_rural_framing categories for health articles
-    health_counts = df_health['urban_rural_framing'].value_counts()
+    health_counts = _framing_counts(df_health['urban_rural_framing'])
     health_total = len(df_health)
     
     # Calculate percentages for all categories
@@ -207,58 +302,11 @@ def create_urban_rural_barchart_no_health_vs_health(figsize=(10, 6)):
     no_health_values = [no_health_pct[cat] for cat in categories]
     health_values = [health_pct[cat] for cat in categories]
     
-    # Create bar chart
-    fig, ax = plt.subplots(figsize=figsize)
-    
-    x = np.arange(len(categories))
-    width = 0.35
-    gap = 0.05  # Small gap between bars
-    
-    # Create bars with borders and transparency for visual depth
-    bars1 = ax.bar(x - width/2 - gap/2, no_health_values, width, 
-                   label=r'Climate articles $\mathit{without}$ health', 
-                   color='#0072B2', alpha=0.7, edgecolor='#0072B2', linewidth=2)
-    bars2 = ax.bar(x + width/2 + gap/2, health_values, width, 
-                   label=r'Climate articles $\mathit{with}$ health', 
-                   color='#E69F00', alpha=0.7, edgecolor='#E69F00', linewidth=2)
-    
-    # Customize chart
-    ax.set_xlabel('Urban/Rural Framing', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Percentage of Articles (%)', fontsize=12, fontweight='bold')
-    #ax.set_title('', fontsize=14, fontweight='bold', pad=20)
-    ax.set_xticks(x)
-    
-    # Custom descriptive labels for display
-    category_labels = ['Neither', 'Urban only', 'Rural only', 'Both urban and rural']
-    ax.set_xticklabels(category_labels)
-    
-    # Add legend
-    ax.legend(frameon=False, fontsize=11, loc='upper right')
-    
-    # Styling
-    ax.grid(False)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_linewidth(1.5)
-    ax.spines['bottom'].set_linewidth(1.5)
-    
-    # Add value labels on top of bars
-    for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.1f}%',
-                   ha='center', va='bottom', fontsize=9)
-    
-    plt.tight_layout()
-    
-    # Save figure
-    os.makedirs('plots/images', exist_ok=True)
-    output_file = 'plots/images/figure2.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
-    print(f"\nBar chart saved to: {output_file}")
-    
-    return fig, ax
+    # Create and save bar chart
+    return _plot_framing_bars(no_health_values, health_values,
+                              r'Climate articles $\mathit{without}$ health',
+                              r'Climate articles $\mathit{with}$ health',
+                              'plots/images/figure2.png', figsize)
 
 
 def test_urban_rural_proportions():
@@ -282,17 +330,20 @@ def test_urban_rural_proportions():
     
     # Load datasets
     print("\nLoading datasets...")
-    df_climate_all = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet', 
-                                      columns=['urban_rural_framing', 'health'])
-    df_health = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet', 
-                                 columns=['urban_rural_framing'])
-    
-    # Filter to get climate articles without health
-    df_no_health = df_climate_all[df_climate_all['health'] != 1]
+    # Framing of climate articles without health
+    framing_no_health = _no_health_framing()
+    df_health = _load_health()
     
-    print(f"Climate articles without health: {len(df_no_health)}")
+    print(f"Climate articles without health: {len(framing_no_health)}")
     print(f"Climate articles with health: {len(df_health)}")
     
+    no_health_total = len(framing_no_health)
+    health_total = len(df_health)
+    
+    # Count every framing category in one pass per dataset
+    no_health_counts = _framing_counts(framing_no_health)
+    health_counts = _framing_counts(df_health['urban_rural_framing'])
+    
     results = {}
     
     # =========================================================================
@@ -304,11 +355,8 @@ def test_urban_rural_proportions():
     print("=" * 70)
     
     # Count articles with any framing (not 'neither')
-    no_health_any_framing = (df_no_health['urban_rural_framing'] != 'neither').sum()
-    health_any_framing = (df_health['urban_rural_framing'] != 'neither').sum()
-    
-    no_health_total = len(df_no_health)
-    health_total = len(df_health)
+    no_health_any_framing = no_health_total - no_health_counts.get('neither', 0)
+    health_any_framing = health_total - health_counts.get('neither', 0)
     
     # Calculate proportions
     prop_no_health = no_health_any_framing / no_health_total
@@ -364,31 +412,36 @@ def test_urban_rural_proportions():
         'both': 'Both urban and rural'
     }
     
-    for category in categories:
+    # Two-proportion z-tests for all categories at once
+    no_health_cat_counts = np.array([no_health_counts.get(category, 0) for category in categories])
+    health_cat_counts = np.array([health_counts.get(category, 0) for category in categories])
+    prop_no_health_cats = no_health_cat_counts / no_health_total
+    prop_health_cats = health_cat_counts / health_total
+    pooled_props = (no_health_cat_counts + health_cat_counts) / (no_health_total + health_total)
+    se_cats = np.sqrt(pooled_props * (1 - pooled_props) * (1/no_health_total + 1/health_total))
+    
+    has_variance = se_cats > 0  # Avoid division by zero
+    z_stats = np.full(len(categories), np.nan)
+    z_stats[has_variance] = (prop_health_cats - prop_no_health_cats)[has_variance] / se_cats[has_variance]
+    p_values = 2 * stats.norm.sf(np.abs(z_stats))  # Two-tailed test; NaN z gives NaN p
+    
+    for i, category in enumerate(categories):
         print(f"\n{'-' * 70}")
         print(f"Category: {category_labels[category]}")
         print(f"{'-' * 70}")
         
-        # Count articles in this category
-        no_health_count = (df_no_health['urban_rural_framing'] == category).sum()
-        health_count = (df_health['urban_rural_framing'] == category).sum()
-        
-        # Calculate proportions
-        prop_no_health_cat = no_health_count / no_health_total
-        prop_health_cat = health_count / health_total
+        no_health_count = no_health_cat_counts[i]
+        health_count = health_cat_counts[i]
+        prop_no_health_cat = prop_no_health_cats[i]
+        prop_health_cat = prop_health_cats[i]
+        z_stat_cat = z_stats[i]
+        p_value_cat = p_values[i]
         
         print(f"Without health: {no_health_count}/{no_health_total} = {prop_no_health_cat:.4f} ({prop_no_health_cat*100:.2f}%)")
         print(f"With health: {health_count}/{health_total} = {prop_health_cat:.4f} ({prop_health_cat*100:.2f}%)")
         print(f"Difference: {(prop_health_cat - prop_no_health_cat):.4f} ({(prop_health_cat - prop_no_health_cat)*100:.2f} percentage points)")
         
-        # Two-proportion z-test
-        pooled_prop_cat = (no_health_count + health_count) / (no_health_total + health_total)
-        se_cat = np.sqrt(pooled_prop_cat * (1 - pooled_prop_cat) * (1/no_health_total + 1/health_total))
-        
-        if se_cat > 0:  # Avoid division by zero
-            z_stat_cat = (prop_health_cat - prop_no_health_cat) / se_cat
-            p_value_cat = 2 * (1 - stats.norm.cdf(abs(z_stat_cat)))  # Two-tailed test
-            
+        if has_variance[i]:
             print(f"\nZ-statistic: {z_stat_cat:.4f}")
             print(f"P-value: {p_value_cat:.6f}")
             
@@ -401,8 +454,6 @@ def test_urban_rural_proportions():
             else:
                 print("Result: NOT SIGNIFICANT (p >= 0.05)")
         else:
-            z_stat_cat = np.nan
-            p_value_cat = np.nan
             print("\nCannot compute test (zero variance)")
         
         results[category] = {
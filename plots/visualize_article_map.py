@@ -9,30 +9,167 @@ This script:
 5. Creates a choropleth map showing article proportions by country
 """
 
-import json
+import os
+import re
+import mmap
+import functools
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
 import geopandas as gpd
+import matplotlib
+matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
-from collections import Counter
+from PIL import Image
 from utils import load_sources
 
 # Configuration
 SHAPEFILE_PATH = 'data/europe_shapefile/CNTR_RG_20M_2024_3035.shp'
 ARTICLES_PATH = 'data/articles/lancet_europe_database.jsonl'
 SOURCES_PATH = 'data/sources/sources.csv'
+SOURCE_URIS_CACHE_PATH = 'data/articles/lancet_europe_database_source_uris.parquet'
+MONTHLY_PATH = 'data/articles/lancet_europe_dataset_monthly.parquet'
+COUNTRY_CACHE_PATH = 'data/articles/lancet_europe_dataset_by_country.parquet'
 
-# Load and aggregate monthly data
-df_monthly = pd.read_parquet('data/articles/lancet_europe_dataset_monthly.parquet')
+# Monthly count columns summed per country
+COUNT_COLUMNS = ['article_count', 'climate', 'health', 'climate_health', 'urban', 'rural']
 
-# Group by country and sum metrics
-df_country = df_monthly.groupby('country_name').agg({
-    'article_count': 'sum',
-    'climate': 'sum', 
-    'health': 'sum',
-    'climate_health': 'sum',
-    'urban': 'sum',
-    'rural': 'sum'
-}).reset_index()
+# Resolution of the saved figures; 300 for publication, e.g. SAVEFIG_DPI=150 for quick drafts
+SAVEFIG_DPI = int(os.environ.get('SAVEFIG_DPI', 300))
+
+# Tolerance (in metres, EPSG:3035) for simplifying country outlines; well below
+# what is visible on a continent-scale map
+SIMPLIFY_TOLERANCE = 5000
+
+# Mainland geometries computed by _prepare_mainland_gdf, keyed by id() of the source GeoDataFrame
+_MAINLAND_CACHE = {}
+
+# Matches the article's top-level "source": {"uri": "..."} without parsing the whole line.
+# A key with unescaped quotes cannot occur inside a JSON string value; URIs containing
+# escape sequences don't match and fall back to a full parse
+SOURCE_URI_PATTERN = re.compile(rb'"source":\s*\{\s*"uri":\s*"([^"\\]*)"')
+
+
+@functools.lru_cache(maxsize=1)
+def load_country_df():
+    """
+    Load article counts per country, summed over all months.
+    
+    The aggregation is cached in COUNTRY_CACHE_PATH, tagged with the monthly
+    dataset's modification time, and only recomputed when the dataset changes.
+    Nothing is read until this is first called.
+    
+    Returns:
+        pd.DataFrame: DataFrame with country_name and the summed COUNT_COLUMNS
+    """
+    src_mtime = str(os.path.getmtime(MONTHLY_PATH)).encode()
+    
+    if os.path.exists(COUNTRY_CACHE_PATH):
+        cached = pq.read_table(COUNTRY_CACHE_PATH)
+        if (cached.schema.metadata or {}).get(b'src_mtime') == src_mtime:
+            return cached.to_pandas()
+    
+    df_monthly = pd.read_parquet(MONTHLY_PATH, columns=['country_name'] + COUNT_COLUMNS, engine='pyarrow')
+    
+    # Group by country and sum metrics
+    country_df = df_monthly.groupby('country_name', as_index=False, sort=True)[COUNT_COLUMNS].sum()
+    
+    table = pa.Table.from_pandas(country_df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'src_mtime': src_mtime})
+    pq.write_table(table, COUNTRY_CACHE_PATH)
+    
+    return country_df
+
+
+def _extract_source_uris(path, start, end):
+    """
+    Extract the source URI of every article in a byte range of a JSONL file.
+    
+    Args:
+        path (str): Path to the JSONL file
+        start (int): Offset of the first line in the range
+        end (int): Offset just past the last line in the range
+    
+    Returns:
+        list: Source URI of each article in the range (None where an article has none)
+    """
+    source_uris = []
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in mm[start:end].split(b'\n'):
+            # Most lines carry the source URI in a fixed layout; only parse the others
+            match = SOURCE_URI_PATTERN.search(line)
+            if match:
+                source_uris.append(match.group(1).decode('utf-8'))
+                continue
+            
+            try:
+                article = orjson.loads(line)
+                source_uris.append(article.get('source', {}).get('uri'))
+            except orjson.JSONDecodeError:
+                continue
+    
+    return source_uris
+
+
+def _load_source_uris(max_workers=None):
+    """
+    Load the source URI of every article in ARTICLES_PATH.
+    
+    The URIs are cached in SOURCE_URIS_CACHE_PATH, tagged with the articles file's
+    modification time, and only extracted from the JSONL again when it changes.
+    Extraction splits the file into newline-aligned chunks processed in parallel.
+    
+    Args:
+        max_workers (int, optional): Number of worker processes for extraction.
+            Defaults to the number of CPUs.
+    
+    Returns:
+        pd.Series: Source URI of each article (missing where an article has none)
+    """
+    src_mtime = str(os.path.getmtime(ARTICLES_PATH)).encode()
+    
+    if os.path.exists(SOURCE_URIS_CACHE_PATH):
+        cached = pq.read_table(SOURCE_URIS_CACHE_PATH)
+        if (cached.schema.metadata or {}).get(b'src_mtime') == src_mtime:
+            print(f"Loaded {cached.num_rows} article source URIs from {SOURCE_URIS_CACHE_PATH}")
+            return cached.column('source_uri').to_pandas()
+    
+    n_chunks = max_workers or os.cpu_count() or 1
+    
+    # Split the file into roughly equal chunks, each ending just after a newline
+    bounds = [0]
+    with open(ARTICLES_PATH, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        for i in range(1, n_chunks):
+            pos = mm.find(b'\n', max(size * i // n_chunks, bounds[-1]))
+            if pos == -1:
+                break
+            bounds.append(pos + 1)
+        bounds.append(size)
+    
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+    
+    # Read articles and extract their source URIs, keeping the file order
+    source_uris = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_extract_source_uris, ARTICLES_PATH, start, end) for start, end in ranges]
+        for future in futures:
+            source_uris.extend(future.result())
+            print(f"  Processed {len(source_uris)} articles...")
+    
+    print(f"Total articles processed: {len(source_uris)}")
+    
+    table = pa.table({'source_uri': pa.array(source_uris, type=pa.string())})
+    table = table.replace_schema_metadata({b'src_mtime': src_mtime})
+    pq.write_table(table, SOURCE_URIS_CACHE_PATH, compression='zstd')
+    
+    return table.column('source_uri').to_pandas()
 
 
 def load_articles_by_country():
@@ -45,37 +182,25 @@ def load_articles_by_country():
     print("Loading sources mapping...")
     sources_df = load_sources()
     
-    # Create a mapping from source_uri to country_name
-    source_to_country = dict(zip(sources_df['source_uri'], sources_df['country_name']))
+    # Encode countries as categorical codes, indexed by source_uri (last entry wins for
+    # duplicated URIs, as in a dict built from the rows)
+    sources_df = sources_df.drop_duplicates('source_uri', keep='last')
+    countries = pd.Categorical(sources_df['country_name'])
+    source_index = pd.Index(sources_df['source_uri'])
     
-    print(f"Loaded {len(source_to_country)} sources")
+    print(f"Loaded {len(source_index)} sources")
     
     print("Counting articles by country...")
-    country_counts = Counter()
+    source_uris = _load_source_uris()
     
-    # Read articles and count by country
-    with open(ARTICLES_PATH, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f):
-            if i % 50000 == 0:
-                print(f"  Processed {i} articles...")
-            
-            try:
-                article = json.loads(line)
-                source_uri = article.get('source', {}).get('uri')
-                
-                if source_uri in source_to_country:
-                    country = source_to_country[source_uri]
-                    country_counts[country] += 1
-            except json.JSONDecodeError:
-                continue
+    # Look up each article's country code in one vectorized pass; articles from unknown
+    # sources (or sources without a country) get -1 and are left out of the counts
+    positions = source_index.get_indexer(source_uris)
+    article_codes = np.where(positions >= 0, countries.codes[positions], -1)
+    counts = np.bincount(article_codes[article_codes >= 0], minlength=len(countries.categories))
     
-    print(f"Total articles processed: {i+1}")
-    
-    # Convert to DataFrame
-    country_df = pd.DataFrame([
-        {'country_name': country, 'article_count': count}
-        for country, count in country_counts.items()
-    ])
+    country_df = pd.DataFrame({'country_name': countries.categories.astype(object), 'article_count': counts})
+    country_df = country_df[country_df['article_count'] > 0].reset_index(drop=True)
     
     print(f"\nArticle counts by country:")
     print(country_df.sort_values('article_count', ascending=False).to_string(index=False))
@@ -89,11 +214,6 @@ def load_shapefile():
     Returns:
         gpd.GeoDataFrame: GeoDataFrame with European country geometries
     """
-    print("\nLoading shapefile...")
-    gdf = gpd.read_file(SHAPEFILE_PATH)
-    
-    print(f"Shapefile loaded: {gdf.shape[0]} total regions")
-    
     # Define European country ISO3 codes
     # Only including countries present in the data sources + immediate neighbors for geographic context
     european_iso_codes = {
@@ -106,8 +226,13 @@ def load_shapefile():
         'TUR', 'UKR', 'MDA', 'LIE'
     }
     
-    # Filter to only European countries
-    gdf_europe = gdf[gdf['ISO3_CODE'].isin(european_iso_codes)].copy()
+    # Filter to only European countries while reading, so the other features are never decoded
+    print("\nLoading shapefile...")
+    iso_code_list = ', '.join(f"'{code}'" for code in sorted(european_iso_codes))
+    gdf_europe = gpd.read_file(SHAPEFILE_PATH, where=f"ISO3_CODE IN ({iso_code_list})")
+    
+    # Simplify outlines once so the explode/area/dissolve steps and plotting handle fewer vertices
+    gdf_europe['geometry'] = gdf_europe.geometry.simplify(SIMPLIFY_TOLERANCE, preserve_topology=True)
     
     print(f"Filtered to {gdf_europe.shape[0]} European countries")
     print(f"Columns: {gdf_europe.columns.tolist()}")
@@ -116,95 +241,31 @@ def load_shapefile():
     
     return gdf_europe
 
-def create_map(gdf, country_df, numerator_col, denominator_col, ax=None, title=None, cmap='YlOrRd', show_percentage=False):
+def _prepare_mainland_gdf(gdf, country_col):
     """
-    Create a choropleth map showing article proportions by country.
+    Build the mainland outline of each country used by the maps: outlying islands,
+    distant territories and small polygons are removed, leaving one geometry per country.
+    
+    The result only depends on the geometries, so it is computed once per GeoDataFrame
+    and reused by every map drawn from it.
     
     Args:
         gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries
-        country_df (pd.DataFrame): DataFrame with article data by country
-        numerator_col (str): Column name to use as numerator
-        denominator_col (str): Column name to use as denominator
-        ax (matplotlib.axes.Axes, optional): Axes to plot on. If None, creates new figure
-        title (str, optional): Custom title for the map. If None, generates default title
-        cmap (str, optional): Colormap for the choropleth. Default is 'YlOrRd'
-        show_percentage (bool, optional): If True, multiply proportion by 100 for display. Default is False
-    """
-    # Determine the country name column in the shapefile
-    # Common possibilities: NAME_ENGL, CNTR_NAME, NAME, etc.
-    country_col = None
-    for col in ['NAME_ENGL', 'CNTR_NAME', 'NAME', 'COUNTRY']:
-        if col in gdf.columns:
-            country_col = col
-            break
-    
-    if country_col is None:
-        print("\nAvailable columns in shapefile:")
-        print(gdf.columns.tolist())
-        raise ValueError("Could not find country name column in shapefile")
+        country_col (str): Name of the country name column in gdf
     
-    print(f"\nUsing '{country_col}' column for country names")
-    
-    # Create country name mapping to handle differences between sources and shapefile
-    country_name_mapping = {
-        'Macedonia': 'North Macedonia',
-        'Bosnia and Herzegovina': 'Bosnia and Herzegovina',
-        'Czech Republic': 'Czechia',
-        'United Kingdom': 'United Kingdom',
-        'Turkey': 'Türkiye',
-    }
-    
-    # Apply mapping
-    country_df['country_name_mapped'] = country_df['country_name'].replace(country_name_mapping)
-    
-    # Merge the data
-    print("\nMerging article data with shapefile...")
-    gdf_merged = gdf.merge(
-        country_df,
-        left_on=country_col,
-        right_on='country_name_mapped',
-        how='left'
-    )
-    
-    # Calculate proportion (handling division by zero)
-    print(f"\nCalculating proportion: {numerator_col} / {denominator_col}")
-    
-    # Use numpy's divide to handle division by zero safely
-    import numpy as np
-    gdf_merged['proportion'] = np.where(
-        gdf_merged[denominator_col] > 0,
-        gdf_merged[numerator_col] / gdf_merged[denominator_col],
-        0
-    )
-    
-    # Replace any remaining NaN or inf values with 0
-    gdf_merged['proportion'] = gdf_merged['proportion'].replace([np.inf, -np.inf], 0).fillna(0)
-    
-    # Create display column for plotting (multiply by 100 if showing percentage)
-    if show_percentage:
-        gdf_merged['display_value'] = gdf_merged['proportion'] * 100
-    else:
-        gdf_merged['display_value'] = gdf_merged['proportion']
-    
-    print(f"Countries with data: {(gdf_merged['proportion'] > 0).sum()}")
-    print(f"Countries without data: {(gdf_merged['proportion'] == 0).sum()}")
-    print(f"Proportion range: {gdf_merged['proportion'].min():.4f} to {gdf_merged['proportion'].max():.4f}")
-    
-    # Create the map
-    print("\nCreating map...")
-    # Create figure only if ax is not provided
-    created_fig = False
-    if ax is None:
-        fig, ax_main = plt.subplots(figsize=(14, 10))
-        created_fig = True
-    else:
-        ax_main = ax
+    Returns:
+        gpd.GeoDataFrame: One mainland geometry per country, with country_col and geometry columns
+    """
+    # Keep a reference to gdf alongside its result, so its id cannot be reused while cached
+    cached = _MAINLAND_CACHE.get(id(gdf))
+    if cached is not None and cached[0] is gdf and cached[1] == country_col:
+        return cached[2]
     
     # Define outlying islands to exclude from continental Europe view
     outliers = ['Iceland', 'Malta']
     
     # Focus on continental Europe + UK and Ireland
-    gdf_main = gdf_merged[~gdf_merged[country_col].isin(outliers)].copy()
+    gdf_main = gdf.loc[~gdf[country_col].isin(outliers), [country_col, 'geometry']]
     
     # Filter out small island territories by keeping only the largest geometries per country
     # This removes overseas territories like Canary Islands, Azores, etc.
@@ -218,10 +279,10 @@ def create_map(gdf, country_df, numerator_col, denominator_col, ax=None, title=N
     # Calculate area for each polygon
     gdf_exploded['area'] = gdf_exploded.geometry.area
     
-    # Get centroid of each polygon to filter by geographic location
-    gdf_exploded['centroid'] = gdf_exploded.geometry.centroid
-    gdf_exploded['lon'] = gdf_exploded['centroid'].x
-    gdf_exploded['lat'] = gdf_exploded['centroid'].y
+    # Get a point inside each polygon to filter by geographic location
+    points = gdf_exploded.geometry.representative_point()
+    gdf_exploded['lon'] = points.x
+    gdf_exploded['lat'] = points.y
     
     # Define bounding box for mainland Europe + UK/Ireland
     # This excludes Atlantic islands (Azores, Canary Islands, etc.)
@@ -240,27 +301,114 @@ def create_map(gdf, country_df, numerator_col, denominator_col, ax=None, title=N
     
     # For each country, keep only polygons with area > 10% of the largest polygon
     # This keeps mainland + nearby islands but removes distant territories
-    filtered_geoms = []
-    for country in gdf_exploded[country_col].unique():
-        country_data = gdf_exploded[gdf_exploded[country_col] == country]
-        max_area = country_data['area'].max()
-        # Keep polygons that are at least 10% of the largest polygon area
-        large_polys = country_data[country_data['area'] > max_area * 0.1]
-        filtered_geoms.append(large_polys)
+    max_area = gdf_exploded.groupby(country_col, sort=False)['area'].transform('max')
+    gdf_filtered = gdf_exploded[gdf_exploded['area'] > max_area * 0.1]
+    
+    # Dissolve back to one geometry per country: sort polygons by country once, then
+    # union each run of equal countries (rows with a missing country are dropped)
+    codes, countries = pd.factorize(gdf_filtered[country_col], sort=True)
+    order = np.flatnonzero(codes >= 0)
+    order = order[np.argsort(codes[order], kind='stable')]
+    starts = np.flatnonzero(np.diff(codes[order])) + 1
+    geoms = gdf_filtered.geometry.to_numpy()[order]
+    gdf_main = gpd.GeoDataFrame(
+        {country_col: countries, 'geometry': [shapely.unary_union(group) for group in np.split(geoms, starts)]},
+        geometry='geometry',
+        crs=gdf.crs
+    )
     
-    gdf_filtered = pd.concat(filtered_geoms, ignore_index=True)
+    _MAINLAND_CACHE[id(gdf)] = (gdf, country_col, gdf_main)
+    return gdf_main
+
+
+def _find_country_col(gdf):
+    """
+    Determine the country name column in the shapefile.
     
-    # Dissolve back to one geometry per country
-    gdf_main = gdf_filtered.dissolve(by=country_col, aggfunc='first').reset_index()
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries
+    
+    Returns:
+        str: Name of the country name column
+    """
+    # Common possibilities: NAME_ENGL, CNTR_NAME, NAME, etc.
+    for col in ['NAME_ENGL', 'CNTR_NAME', 'NAME', 'COUNTRY']:
+        if col in gdf.columns:
+            print(f"\nUsing '{col}' column for country names")
+            return col
+    
+    print("\nAvailable columns in shapefile:")
+    print(gdf.columns.tolist())
+    raise ValueError("Could not find country name column in shapefile")
+
+
+def _merge_country_data(gdf, country_df, country_col):
+    """
+    Join article data by country onto the shapefile.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries
+        country_df (pd.DataFrame): DataFrame with article data by country
+        country_col (str): Name of the country name column in gdf
+    
+    Returns:
+        gpd.GeoDataFrame: gdf with the article data of each country (missing where there is none)
+    """
+    # Create country name mapping to handle differences between sources and shapefile
+    country_name_mapping = {
+        'Macedonia': 'North Macedonia',
+        'Bosnia and Herzegovina': 'Bosnia and Herzegovina',
+        'Czech Republic': 'Czechia',
+        'United Kingdom': 'United Kingdom',
+        'Turkey': 'Türkiye',
+    }
+    
+    # Apply mapping, indexing the country data by the shapefile's country names
+    # (one hash lookup per name; names without a mapping keep their original value)
+    country_names = country_df['country_name']
+    country_df_idx = country_df.set_index(
+        country_names.map(country_name_mapping).fillna(country_names).rename('country_name_mapped')
+    )
+    
+    # Join the data on that index
+    print("\nMerging article data with shapefile...")
+    return gdf.join(country_df_idx, on=country_col)
+
+
+def _plot_choropleth(gdf_merged, gdf, country_col, column, ax, cmap, title, symmetric=False):
+    """
+    Plot one value per country on the mainland map.
+    
+    Args:
+        gdf_merged (gpd.GeoDataFrame): GeoDataFrame from _merge_country_data with the column to plot
+        gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries that gdf_merged was built from
+        country_col (str): Name of the country name column
+        column (str): Name of the column to plot
+        ax (matplotlib.axes.Axes): Axes to plot on
+        cmap (str or colormap): Colormap for the choropleth
+        title (str): Map title; a second line after a newline is drawn as a regular-weight subtitle
+        symmetric (bool, optional): If True, center the color scale at 0. Default is False
+    """
+    # Mainland geometry per country (shared across maps), joined with the values to plot
+    gdf_main = _prepare_mainland_gdf(gdf, country_col).merge(
+        gdf_merged[[country_col, column]], on=country_col, how='left'
+    )
+    
+    # Get max absolute value for symmetric colorbar
+    limits = {}
+    if symmetric:
+        vmax = max(abs(gdf_main[column].min()), abs(gdf_main[column].max()))
+        limits = {'vmin': -vmax, 'vmax': vmax}
     
     # Plot map (continental Europe + UK/Ireland only, no distant islands)
     gdf_main.plot(
-        column='display_value',
-        ax=ax_main,
+        column=column,
+        ax=ax,
         legend=True,
         cmap=cmap,
         edgecolor='black',
         linewidth=0.5,
+        **limits,
         legend_kwds={
             'orientation': 'vertical',
             'shrink': 0.3,
@@ -269,29 +417,115 @@ def create_map(gdf, country_df, numerator_col, denominator_col, ax=None, title=N
         }
     )
     
-    # Set title with formatting (bold main title, regular subtitle)
-    if title is None:
-        title = f'Proportion of {numerator_col} to {denominator_col} by European Country'
-    
     # Check if title has newline (for two-part titles with different formatting)
     if '\n' in title:
         parts = title.split('\n')
         # Add bold first line as title
-        ax_main.set_title(parts[0], fontsize=12, fontweight='bold', pad=18)
+        ax.set_title(parts[0], fontsize=12, fontweight='bold', pad=18)
         # Add regular second line as text annotation below the title
-        ax_main.text(0.5, 1.005, parts[1], transform=ax_main.transAxes, 
-                     fontsize=12, ha='center', va='top', fontweight='normal')
+        ax.text(0.5, 1.005, parts[1], transform=ax.transAxes, 
+                fontsize=12, ha='center', va='top', fontweight='normal')
     else:
-        ax_main.set_title(title, fontsize=12, fontweight='bold', pad=10)
+        ax.set_title(title, fontsize=12, fontweight='bold', pad=10)
+    
+    ax.axis('off')
+
+
+def _map_input_hash(gdf, country_df, *params):
+    """
+    Hash the data and plotting parameters a saved map is drawn from.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries
+        country_df (pd.DataFrame): DataFrame with article data by country
+        *params: Plotting parameters that change the image (columns, title, colormap name, dpi, ...)
+    
+    Returns:
+        str: 16 character hex digest
+    """
+    h = hashlib.blake2b(repr(params).encode(), digest_size=8)
+    h.update(pd.util.hash_pandas_object(country_df, index=False).to_numpy().tobytes())
+    attributes = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    h.update(pd.util.hash_pandas_object(attributes, index=False).to_numpy().tobytes())
+    h.update(b''.join(gdf.geometry.to_wkb()))
+    return h.hexdigest()
+
+
+def _figure_is_current(output_file, input_hash):
+    """Check whether output_file was saved from inputs with the given hash."""
+    if not os.path.exists(output_file):
+        return False
+    with Image.open(output_file) as img:
+        return img.text.get('InputHash') == input_hash
+
+
+def create_map(gdf, country_df, numerator_col, denominator_col, ax=None, title=None, cmap='YlOrRd', show_percentage=False):
+    """
+    Create a choropleth map showing article proportions by country.
+    
+    Args:
+        gdf (gpd.GeoDataFrame): GeoDataFrame with country geometries
+        country_df (pd.DataFrame): DataFrame with article data by country
+        numerator_col (str): Column name to use as numerator
+        denominator_col (str): Column name to use as denominator
+        ax (matplotlib.axes.Axes, optional): Axes to plot on. If None, creates new figure
+        title (str, optional): Custom title for the map. If None, generates default title
+        cmap (str, optional): Colormap for the choropleth. Default is 'YlOrRd'
+        show_percentage (bool, optional): If True, multiply proportion by 100 for display. Default is False
+    """
+    country_col = _find_country_col(gdf)
+    gdf_merged = _merge_country_data(gdf, country_df, country_col)
+    
+    # Calculate proportion (handling division by zero)
+    print(f"\nCalculating proportion: {numerator_col} / {denominator_col}")
+    
+    # Use numpy's divide to handle division by zero safely: only countries with a
+    # positive denominator are divided, all others (including missing data) stay 0
+    denom = gdf_merged[denominator_col].to_numpy(dtype=float)
+    proportion = np.zeros_like(denom)
+    np.divide(gdf_merged[numerator_col].to_numpy(dtype=float), denom, out=proportion, where=denom > 0)
+    gdf_merged['proportion'] = proportion
+    
+    # Create display column for plotting (multiply by 100 if showing percentage)
+    # float32 is plenty for colormap lookup; the float64 proportion is kept for the summary table
+    if show_percentage:
+        gdf_merged['display_value'] = (proportion * 100).astype(np.float32)
+    else:
+        gdf_merged['display_value'] = proportion.astype(np.float32)
+    
+    print(f"Countries with data: {(gdf_merged['proportion'] > 0).sum()}")
+    print(f"Countries without data: {(gdf_merged['proportion'] == 0).sum()}")
+    print(f"Proportion range: {gdf_merged['proportion'].min():.4f} to {gdf_merged['proportion'].max():.4f}")
+    
+    # Create figure only if ax is not provided, skipping it when the saved map
+    # was made from the same inputs
+    created_fig = False
+    if ax is None:
+        output_file = 'data/images/article_frequency_map.png'
+        input_hash = _map_input_hash(gdf, country_df, numerator_col, denominator_col, title,
+                                     getattr(cmap, 'name', cmap), show_percentage, SAVEFIG_DPI)
+        if _figure_is_current(output_file, input_hash):
+            print(f"\n{output_file} is up to date, skipping")
+            return gdf_merged, country_col
+        fig, ax_main = plt.subplots(figsize=(14, 10))
+        created_fig = True
+    else:
+        ax_main = ax
+    
+    # Create the map
+    print("\nCreating map...")
+    
+    if title is None:
+        title = f'Proportion of {numerator_col} to {denominator_col} by European Country'
     
-    ax_main.axis('off')
+    _plot_choropleth(gdf_merged, gdf, country_col, 'display_value', ax_main, cmap, title)
     
     # Save the map only if we created the figure
     if created_fig:
         import os
         os.makedirs('data/images', exist_ok=True)
-        output_file = 'data/images/article_frequency_map.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+        plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                    metadata={'InputHash': input_hash})
         print(f"\nMap saved to: {output_file}")
         plt.close()
     
@@ -308,8 +542,16 @@ def create_two_maps(gdf, country_df):
         country_df (pd.DataFrame): DataFrame with article data by country
     
     Returns:
-        tuple: (fig, (ax1, ax2), gdf_merged1, gdf_merged2, country_col)
+        tuple: (fig, (ax1, ax2), gdf_merged1, gdf_merged2, country_col); everything but
+            country_col is None if the saved grid is already up to date
     """
+    # Skip rendering when the saved grid was made from the same inputs
+    output_file = 'data/images/article_frequency_maps_grid.png'
+    input_hash = _map_input_hash(gdf, country_df, 'two_maps', SAVEFIG_DPI)
+    if _figure_is_current(output_file, input_hash):
+        print(f"\n{output_file} is up to date, skipping")
+        return None, (None, None), None, None, _find_country_col(gdf)
+    
     print("\nCreating two-map grid visualization...")
     
     # Create figure with two subplots
@@ -338,9 +580,9 @@ def create_two_maps(gdf, country_df):
     # Save the combined figure
     import os
     os.makedirs('data/images', exist_ok=True)
-    output_file = 'data/images/article_frequency_maps_grid.png'
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+    plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                metadata={'InputHash': input_hash})
     print(f"\nCombined map saved to: {output_file}")
     
     plt.show()
@@ -365,153 +607,56 @@ def create_difference_map(gdf, country_df, numerator_col1, numerator_col2, denom
     Returns:
         tuple: (gdf_merged, country_col)
     """
-    # Determine the country name column in the shapefile
-    country_col = None
-    for col in ['NAME_ENGL', 'CNTR_NAME', 'NAME', 'COUNTRY']:
-        if col in gdf.columns:
-            country_col = col
-            break
-    
-    if country_col is None:
-        print("\nAvailable columns in shapefile:")
-        print(gdf.columns.tolist())
-        raise ValueError("Could not find country name column in shapefile")
-    
-    print(f"\nUsing '{country_col}' column for country names")
-    
-    # Create country name mapping
-    country_name_mapping = {
-        'Macedonia': 'North Macedonia',
-        'Bosnia and Herzegovina': 'Bosnia and Herzegovina',
-        'Czech Republic': 'Czechia',
-        'United Kingdom': 'United Kingdom',
-        'Turkey': 'Türkiye',
-    }
-    
-    # Apply mapping
-    country_df['country_name_mapped'] = country_df['country_name'].replace(country_name_mapping)
-    
-    # Merge the data
-    print("\nMerging article data with shapefile...")
-    gdf_merged = gdf.merge(
-        country_df,
-        left_on=country_col,
-        right_on='country_name_mapped',
-        how='left'
-    )
+    country_col = _find_country_col(gdf)
+    gdf_merged = _merge_country_data(gdf, country_df, country_col)
     
     # Calculate difference in proportions as percentage
     print(f"\nCalculating difference: ({numerator_col1}/{denominator_col} - {numerator_col2}/{denominator_col}) * 100")
     
-    import numpy as np
+    # Calculate proportions, dividing only where the denominator is positive
+    denom = gdf_merged[denominator_col].to_numpy(dtype=float)
+    has_data = denom > 0
+    prop1 = np.zeros_like(denom)
+    prop2 = np.zeros_like(denom)
+    np.divide(gdf_merged[numerator_col1].to_numpy(dtype=float), denom, out=prop1, where=has_data)
+    np.divide(gdf_merged[numerator_col2].to_numpy(dtype=float), denom, out=prop2, where=has_data)
     
-    # Calculate proportions
-    prop1 = np.where(
-        gdf_merged[denominator_col] > 0,
-        gdf_merged[numerator_col1] / gdf_merged[denominator_col],
-        0
-    )
-    prop2 = np.where(
-        gdf_merged[denominator_col] > 0,
-        gdf_merged[numerator_col2] / gdf_merged[denominator_col],
-        0
-    )
-    
-    # Calculate difference and convert to percentage
-    gdf_merged['difference'] = (prop1 - prop2) * 100
-    gdf_merged['difference'] = gdf_merged['difference'].replace([np.inf, -np.inf], 0).fillna(0)
+    # Calculate difference and convert to percentage (float32 is plenty for colormap lookup)
+    gdf_merged['difference'] = ((prop1 - prop2) * 100).astype(np.float32)
     
     print(f"Countries with data: {(gdf_merged[denominator_col] > 0).sum()}")
     print(f"Difference range: {gdf_merged['difference'].min():.2f}% to {gdf_merged['difference'].max():.2f}%")
     
-    # Create the map
-    print("\nCreating difference map...")
+    # Create figure only if ax is not provided, skipping it when the saved map
+    # was made from the same inputs
     created_fig = False
     if ax is None:
+        output_file = 'data/images/difference_map.png'
+        input_hash = _map_input_hash(gdf, country_df, numerator_col1, numerator_col2, denominator_col,
+                                     title, getattr(cmap, 'name', cmap), SAVEFIG_DPI)
+        if _figure_is_current(output_file, input_hash):
+            print(f"\n{output_file} is up to date, skipping")
+            return gdf_merged, country_col
         fig, ax_main = plt.subplots(figsize=(14, 10))
         created_fig = True
     else:
         ax_main = ax
     
-    # Define outlying islands to exclude
-    outliers = ['Iceland', 'Malta']
-    gdf_main = gdf_merged[~gdf_merged[country_col].isin(outliers)].copy()
-    
-    # Filter out small island territories
-    import warnings
-    warnings.filterwarnings('ignore', category=UserWarning)
-    
-    gdf_exploded = gdf_main.explode(index_parts=True).reset_index(drop=False)
-    gdf_exploded['area'] = gdf_exploded.geometry.area
-    gdf_exploded['centroid'] = gdf_exploded.geometry.centroid
-    gdf_exploded['lon'] = gdf_exploded['centroid'].x
-    gdf_exploded['lat'] = gdf_exploded['centroid'].y
-    
-    # Bounding box for mainland Europe
-    min_lon = 2000000
-    max_lon = 7500000
-    min_lat = 1000000
-    max_lat = 7500000
-    
-    gdf_exploded = gdf_exploded[
-        (gdf_exploded['lon'] >= min_lon) &
-        (gdf_exploded['lon'] <= max_lon) &
-        (gdf_exploded['lat'] >= min_lat) &
-        (gdf_exploded['lat'] <= max_lat)
-    ]
-    
-    # Keep only large polygons
-    filtered_geoms = []
-    for country in gdf_exploded[country_col].unique():
-        country_data = gdf_exploded[gdf_exploded[country_col] == country]
-        max_area = country_data['area'].max()
-        large_polys = country_data[country_data['area'] > max_area * 0.1]
-        filtered_geoms.append(large_polys)
-    
-    gdf_filtered = pd.concat(filtered_geoms, ignore_index=True)
-    gdf_main = gdf_filtered.dissolve(by=country_col, aggfunc='first').reset_index()
-    
-    # Get max absolute value for symmetric colorbar
-    vmax = max(abs(gdf_main['difference'].min()), abs(gdf_main['difference'].max()))
-    
-    # Plot map with symmetric colorbar centered at 0
-    gdf_main.plot(
-        column='difference',
-        ax=ax_main,
-        legend=True,
-        cmap=cmap,
-        edgecolor='black',
-        linewidth=0.5,
-        vmin=-vmax,
-        vmax=vmax,
-        legend_kwds={
-            'orientation': 'vertical',
-            'shrink': 0.3,
-            'aspect': 15,
-            'pad': 0.02
-        }
-    )
+    # Create the map
+    print("\nCreating difference map...")
     
-    # Set title with formatting
     if title is None:
         title = f'{numerator_col1} - {numerator_col2} (% of {denominator_col})'
     
-    if '\n' in title:
-        parts = title.split('\n')
-        ax_main.set_title(parts[0], fontsize=12, fontweight='bold', pad=18)
-        ax_main.text(0.5, 1.005, parts[1], transform=ax_main.transAxes, 
-                     fontsize=12, ha='center', va='top', fontweight='normal')
-    else:
-        ax_main.set_title(title, fontsize=12, fontweight='bold', pad=10)
-    
-    ax_main.axis('off')
+    # Symmetric colorbar centered at 0
+    _plot_choropleth(gdf_merged, gdf, country_col, 'difference', ax_main, cmap, title, symmetric=True)
     
     # Save if we created the figure
     if created_fig:
         import os
         os.makedirs('data/images', exist_ok=True)
-        output_file = 'data/images/difference_map.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+        plt.savefig(output_file, dpi=SAVEFIG_DPI, bbox_inches='tight', facecolor='white',
+                    metadata={'InputHash': input_hash})
         print(f"\nDifference map saved to: {output_file}")
         plt.close()
     
@@ -555,8 +700,8 @@ def main(numerator_col='climate_health', denominator_col='article_count'):
     print(f"Plotting proportion: {numerator_col} / {denominator_col}")
     print("=" * 60)
     
-    # Use the pre-loaded df_country data
-    country_df = df_country
+    # Load country data
+    country_df = load_country_df()
     
     print(f"\nCountry data loaded: {len(country_df)} countries")
     print(f"Available columns: {country_df.columns.tolist()}")
@@ -587,8 +732,8 @@ def main_two_maps():
     print("European Climate & Health News Articles - Two-Map Grid")
     print("=" * 60)
     
-    # Use the pre-loaded df_country data
-    country_df = df_country
+    # Load country data
+    country_df = load_country_df()
     
     print(f"\nCountry data loaded: {len(country_df)} countries")
     print(f"Available columns: {country_df.columns.tolist()}")
@@ -620,13 +765,13 @@ def main_combined_with_timeseries():
     gdf = load_shapefile()
     
     # Load country data
-    country_df = df_country
+    country_df = load_country_df()
     
     # Import time series data and function
-    from plots.plot_time_series import plot_combined_maps_and_timeseries, df_grouped
+    from plots.plot_time_series import plot_combined_maps_and_timeseries, load_grouped
     
     # Create combined visualization
-    fig = plot_combined_maps_and_timeseries(df_grouped, country_df, gdf)
+    fig = plot_combined_maps_and_timeseries(load_grouped(), country_df, gdf)
     
     print("\n" + "=" * 60)
     print("Combined visualization complete!")
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from classify.keyword_classifier import classify_with_keywords
+
+
+def test_non_ascii_keywords_match_their_documents():
+    # Python's str.lower() maps 'İ' to 'i̇' and a word-final 'Σ' to 'ς'; documents
+    # must be lowercased the same way as the keywords for these to match
+    df = pd.DataFrame({
+        'text': [
+            'İklim değişikliği haberleri',
+            'Η ΘΕΡΜΟΚΡΑΣΙΑΣ ανεβαίνει',
+            'sports news today',
+            'technology news today',
+        ]
+    })
+
+    result = classify_with_keywords(df, 'text', ['İklim', 'ΘΕΡΜΟΚΡΑΣΙΑΣ'], threshold=0.1)
+
+    assert (result['bm25_score'].iloc[:2] > 0).all()
+    assert result['bm25_classification'].tolist() == [True, True, False, False]
@@ -1,8 +1,29 @@
 """Utility functions to use across the package"""
 import os
-import json
+import functools
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Columns of the sources CSV that are parsed as categoricals, so the isin/equality
+# filters below compare integer codes instead of strings
+SOURCE_CATEGORY_COLUMNS = ('status', 'dominant_language', 'country_name')
+
+# Characters replaced with underscores when an article URI is used as a filename
+_SAFE_URI_TABLE = str.maketrans('/\\:', '___')
+
+# Shared HTTP session so repeated image downloads reuse pooled connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=32, pool_maxsize=32,
+                       max_retries=Retry(total=2, backoff_factor=0.3))
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
 
 
 def flatten(list_of_lists):
@@ -17,7 +38,7 @@ def flatten(list_of_lists):
         The flattened list
     '''
 
-    return [item for sublist in list_of_lists for item in sublist]
+    return list(chain.from_iterable(list_of_lists))
 
 
 def load_sources(sources_file: str = 'data/sources/sources.csv') -> pd.DataFrame:
@@ -28,9 +49,15 @@ def load_sources(sources_file: str = 'data/sources/sources.csv') -> pd.DataFrame
         sources_file (str): Path to the sources CSV file
         
     Returns:
-        pd.DataFrame: DataFrame containing source information
+        pd.DataFrame: DataFrame containing source information, with the low-cardinality
+            status, dominant_language and country_name columns as categoricals
     """
-    return pd.read_csv(sources_file)
+    convert_options = pacsv.ConvertOptions(
+        column_types={col: pa.dictionary(pa.int32(), pa.string()) for col in SOURCE_CATEGORY_COLUMNS},
+        strings_can_be_null=True,
+    )
+    # Dictionary-encoded columns convert to pandas categoricals
+    return pacsv.read_csv(sources_file, convert_options=convert_options).to_pandas()
 
 
 def filter_sources_by_languages(sources_df: pd.DataFrame, languages: list, status: str = 'success') -> pd.DataFrame:
@@ -69,10 +96,61 @@ def filter_sources_by_countries(sources_df: pd.DataFrame, countries: list, statu
     ]
 
 
+@functools.lru_cache(maxsize=None)
+def _read_keywords_file(keywords_file: str) -> dict:
+    """
+    Parse a keywords JSON file once per process; shared by every language lookup.
+    
+    Args:
+        keywords_file (str): Path to the keywords JSON file
+        
+    Returns:
+        dict: Mapping of ISO 639-3 language code to its list of keywords
+    """
+    with open(keywords_file, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def _load_keywords_cached(language: str, keywords_file: str) -> tuple:
+    """
+    Read and normalize the keywords for one language, cached per (language, file).
+    Errors reading or parsing the file are raised rather than cached.
+    
+    Args:
+        language (str): ISO 639-3 language code to load keywords for
+        keywords_file (str): Path to the keywords JSON file
+        
+    Returns:
+        tuple: Normalized keywords for the specified language
+    """
+    keywords_dict = _read_keywords_file(keywords_file)
+    
+    # Get keywords for the specified language
+    if language not in keywords_dict:
+        print(f"WARNING: Language '{language}' not found in {keywords_file}")
+        print(f"Available languages: {', '.join(keywords_dict.keys())}")
+        return ()
+    
+    keywords = keywords_dict[language]
+    
+    if not keywords:
+        print(f"WARNING: No keywords found for language '{language}'")
+        return ()
+    
+    # Normalize keywords to lowercase, keeping acronyms (all caps, length > 1) as is
+    normalized_keywords = tuple(kw if kw.isupper() and len(kw) > 1 else kw.lower() for kw in keywords)
+    
+    print(f"Loaded {len(normalized_keywords)} keywords for {language}")
+    
+    return normalized_keywords
+
+
 def load_keywords(language: str, keywords_file: str = 'data/translations/climate_official_translations.json') -> list:
     """
     Load keywords from the translations JSON file for a specific language.
     Returns a list of normalized keywords (lowercase except for acronyms).
+    The file is read and parsed once per (language, keywords_file) pair.
     
     Args:
         language (str): ISO 639-3 language code to load keywords for (e.g., 'eng', 'spa', 'deu')
@@ -81,51 +159,13 @@ def load_keywords(language: str, keywords_file: str = 'data/translations/climate
     Returns:
         list: List of normalized keywords for the specified language
     """
-    import json
-    
-    def normalize_keyword(keyword: str) -> str:
-        """
-        Normalize keyword to lowercase, except for acronyms (all caps) which stay as is.
-        
-        Args:
-            keyword (str): The keyword to normalize
-            
-        Returns:
-            str: Normalized keyword
-        """
-        # Check if it's an acronym (all uppercase letters, length > 1)
-        if keyword.isupper() and len(keyword) > 1:
-            return keyword  # Keep acronyms as is
-        else:
-            return keyword.lower()  # Convert everything else to lowercase
-    
     try:
-        with open(keywords_file, 'r', encoding='utf-8') as f:
-            keywords_dict = json.load(f)
-        
-        # Get keywords for the specified language
-        if language not in keywords_dict:
-            print(f"WARNING: Language '{language}' not found in {keywords_file}")
-            print(f"Available languages: {', '.join(keywords_dict.keys())}")
-            return []
-        
-        keywords = keywords_dict[language]
-        
-        if not keywords:
-            print(f"WARNING: No keywords found for language '{language}'")
-            return []
-        
-        # Normalize keywords (lowercase except for acronyms)
-        normalized_keywords = [normalize_keyword(kw) for kw in keywords]
-        
-        print(f"Loaded {len(normalized_keywords)} keywords for {language}")
-        
-        return normalized_keywords
+        return list(_load_keywords_cached(language, keywords_file))
         
     except FileNotFoundError:
         print(f"Keywords file {keywords_file} not found")
         return []
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error parsing JSON file {keywords_file}: {e}")
         return []
     except Exception as e:
@@ -147,19 +187,44 @@ def download_image(url, save_path, timeout=10):
     """
     success = False
     try:
-        response = requests.get(url, timeout=timeout)
-        if response.status_code == 200:
-            with open(save_path, 'wb') as file:
-                file.write(response.content)
-            success = True
-        else:
-            print("Failed to download the image")
+        with _SESSION.get(url, timeout=timeout, stream=True) as response:
+            if response.status_code == 200:
+                with open(save_path, 'wb') as file:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        file.write(chunk)
+                success = True
+            else:
+                print("Failed to download the image")
     except requests.RequestException as e:
         print(f"An error occurred: {e}")
     
     return success
 
 
+def download_images(urls, save_paths, timeout=10, max_workers=16):
+    """
+    Downloads several images concurrently, one thread per in-flight request.
+    
+    Args:
+        urls (list): The URLs of the images to download.
+        save_paths (list): The paths to save each image to, aligned with urls.
+        timeout (int): The number of seconds to wait before timing out each download.
+        max_workers (int): Maximum number of concurrent downloads.
+    
+    Returns:
+        list: One bool per URL, True if that image was downloaded successfully.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda args: download_image(*args, timeout=timeout),
+                                 zip(urls, save_paths)))
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    # Only the first call per directory reaches the filesystem
+    os.makedirs(path, exist_ok=True)
+
+
 def save_article_as_json(article: dict, articles_dir: str = 'data/articles') -> str:
     '''
     Save an article as a JSON file using its URI as the filename.
@@ -173,7 +238,7 @@ def save_article_as_json(article: dict, articles_dir: str = 'data/articles') ->
     '''
     try:
         # Create articles directory if it doesn't exist
-        os.makedirs(articles_dir, exist_ok=True)
+        _ensure_dir(articles_dir)
         
         # Use article URI as filename
         if 'uri' not in article:
@@ -183,13 +248,18 @@ def save_article_as_json(article: dict, articles_dir: str = 'data/articles') ->
         # Clean URI to make it filesystem-safe
         uri = article['uri']
         # Replace problematic characters with underscores
-        safe_uri = uri.replace('/', '_').replace('\\', '_').replace(':', '_')
+        safe_uri = uri.translate(_SAFE_URI_TABLE)
         filename = f'{safe_uri}.json'
         filepath = os.path.join(articles_dir, filename)
         
-        # Save article as JSON
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(article, f, indent=2, ensure_ascii=False, default=str)
+        # Save article as JSON, writing to a temporary file first so a crash never
+        # leaves a truncated file behind. Datetimes are passed to str() as before.
+        data = orjson.dumps(article, default=str,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME)
+        tmp_filepath = filepath + '.tmp'
+        with open(tmp_filepath, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_filepath, filepath)
         
         return filepath
         
@@ -198,11 +268,15 @@ def save_article_as_json(article: dict, articles_dir: str = 'data/articles') ->
         return None
 
 
+# EEA38 plus UK country names, built once and shared by every caller
+_EEA38_PLUS_UK_COUNTRIES = frozenset(["Albania", "Austria", "Belgium", "Bosnia and Herzegovina", "Bulgaria", "Croatia", "Cyprus", "Czech Republic", "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary", "Iceland", "Ireland", "Italy", "Latvia", "Liechtenstein", "Lithuania", "Luxembourg", "Macedonia", "Malta", "Moldova", "Montenegro", "Netherlands", "Norway", "Poland", "Portugal", "Romania", "Serbia", "Slovakia", "Slovenia", "Spain", "Sweden", "Switzerland", "Turkey", "Ukraine", "United Kingdom"])
+
+
 def get_eea38_plus_uk_countries():
     """
-    Load the list of EEA38 plus UK countries from constants.
+    Load the set of EEA38 plus UK countries from constants.
     
     Returns:
-        list: List of country names in the EEA38 plus UK region
+        frozenset: Country names in the EEA38 plus UK region
     """
-    return ["Albania", "Austria", "Belgium", "Bosnia and Herzegovina", "Bulgaria", "Croatia", "Cyprus", "Czech Republic", "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary", "Iceland", "Ireland", "Italy", "Latvia", "Liechtenstein", "Lithuania", "Luxembourg", "Macedonia", "Malta", "Moldova", "Montenegro", "Netherlands", "Norway", "Poland", "Portugal", "Romania", "Serbia", "Slovakia", "Slovenia", "Spain", "Sweden", "Switzerland", "Turkey", "Ukraine", "United Kingdom"]
+    return _EEA38_PLUS_UK_COUNTRIES
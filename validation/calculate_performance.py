@@ -1,13 +1,11 @@
 import pandas as pd
 import numpy as np
-from sklearn.metrics import precision_score, recall_score, f1_score, classification_report, hamming_loss, accuracy_score
+from sklearn.metrics import precision_recall_fscore_support, classification_report, hamming_loss, accuracy_score
 pd.set_option('display.max_columns', None)
-pd.set_option('display.max_rows', None)
 
 # Start with health, urban, and rural
-df = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet')
-
-df_predictions = df[['uri', 'health', 'urban_rural_framing']]
+df_predictions = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet',
+                                 columns=['uri', 'health', 'urban_rural_framing'], engine='pyarrow')
 
 df_validation = pd.read_csv('data/validation/lancet_validation_health_urban_rural.csv')
 
@@ -22,16 +20,14 @@ df_combined = df_combined.rename(columns={
     'urban_rural_framing': 'urban_rural_framing_pred'
 })
 
-# Break up urban_rural_framing_pred into binary columns
-df_combined['urban_pred'] = 0
-df_combined['rural_pred'] = 0
-df_combined['not_urban_rural_pred'] = 0
-
-# Set values based on urban_rural_framing_pred
-df_combined.loc[df_combined['urban_rural_framing_pred'] == 'urban', 'urban_pred'] = 1
-df_combined.loc[df_combined['urban_rural_framing_pred'] == 'rural', 'rural_pred'] = 1
-df_combined.loc[df_combined['urban_rural_framing_pred'] == 'both', ['urban_pred', 'rural_pred']] = 1
-df_combined.loc[df_combined['urban_rural_framing_pred'] == 'neither', 'not_urban_rural_pred'] = 1
+# Break up urban_rural_framing_pred into binary columns in a single pass;
+# missing predictions and absent framings give all-zero rows
+framing_dummies = pd.get_dummies(df_combined['urban_rural_framing_pred']).reindex(
+    columns=['urban', 'rural', 'both', 'neither'], fill_value=False
+)
+df_combined['urban_pred'] = (framing_dummies['urban'] | framing_dummies['both']).astype(int)
+df_combined['rural_pred'] = (framing_dummies['rural'] | framing_dummies['both']).astype(int)
+df_combined['not_urban_rural_pred'] = framing_dummies['neither'].astype(int)
 
 # Reformat bm25_pred to int
 df_combined['bm25_pred'] = df_combined['bm25_pred'].astype(int)
@@ -50,9 +46,8 @@ def calculate_metrics(y_true, y_pred, labels=None, average='binary'):
     Returns:
     - Dictionary with precision, recall, and F1 scores
     """
-    precision = precision_score(y_true, y_pred, labels=labels, average=average, zero_division=0)
-    recall = recall_score(y_true, y_pred, labels=labels, average=average, zero_division=0)
-    f1 = f1_score(y_true, y_pred, labels=labels, average=average, zero_division=0)
+    precision, recall, f1, _ = precision_recall_fscore_support(
+        y_true, y_pred, labels=labels, average=average, zero_division=0)
     
     return {
         'precision': precision,
@@ -112,21 +107,23 @@ def print_multilabel_performance(df, actual_cols, pred_cols, task_name):
     print(f"{task_name} Multilabel Performance Metrics")
     print(f"{'='*60}")
     
-    # Calculate multilabel metrics
+    # Calculate multilabel metrics; precision_recall_fscore_support returns all three
+    # scores from a single pass per averaging method
     # Samples-based metrics (macro-averaged across samples)
-    precision_samples = precision_score(y_true, y_pred, average='samples', zero_division=0)
-    recall_samples = recall_score(y_true, y_pred, average='samples', zero_division=0)
-    f1_samples = f1_score(y_true, y_pred, average='samples', zero_division=0)
+    precision_samples, recall_samples, f1_samples, _ = precision_recall_fscore_support(
+        y_true, y_pred, average='samples', zero_division=0)
     
     # Micro-averaged metrics (aggregate over all label-sample pairs)
-    precision_micro = precision_score(y_true, y_pred, average='micro', zero_division=0)
-    recall_micro = recall_score(y_true, y_pred, average='micro', zero_division=0)
-    f1_micro = f1_score(y_true, y_pred, average='micro', zero_division=0)
+    precision_micro, recall_micro, f1_micro, _ = precision_recall_fscore_support(
+        y_true, y_pred, average='micro', zero_division=0)
     
     # Macro-averaged metrics (unweighted mean of per-label metrics)
-    precision_macro = precision_score(y_true, y_pred, average='macro', zero_division=0)
-    recall_macro = recall_score(y_true, y_pred, average='macro', zero_division=0)
-    f1_macro = f1_score(y_true, y_pred, average='macro', zero_division=0)
+    precision_macro, recall_macro, f1_macro, _ = precision_recall_fscore_support(
+        y_true, y_pred, average='macro', zero_division=0)
+    
+    # Per-label metrics, one value per column
+    precision_labels, recall_labels, f1_labels, _ = precision_recall_fscore_support(
+        y_true, y_pred, average=None, zero_division=0)
     
     # Subset accuracy (exact match)
     subset_accuracy = accuracy_score(y_true, y_pred)
@@ -154,11 +151,9 @@ def print_multilabel_performance(df, actual_cols, pred_cols, task_name):
     print(f"  Hamming Loss:                   {hamming:.4f}")
     
     print(f"\nPer-Label Metrics:")
-    for i, (actual_col, pred_col) in enumerate(zip(actual_cols, pred_cols)):
+    for i, actual_col in enumerate(actual_cols):
         label_name = actual_col.replace('_code', '').replace('not_urban_rural', 'neither')
-        precision = precision_score(df_clean[actual_col], df_clean[pred_col], average='binary', zero_division=0)
-        recall = recall_score(df_clean[actual_col], df_clean[pred_col], average='binary', zero_division=0)
-        f1 = f1_score(df_clean[actual_col], df_clean[pred_col], average='binary', zero_division=0)
+        precision, recall, f1 = precision_labels[i], recall_labels[i], f1_labels[i]
         print(f"  {label_name:20s} - Precision: {precision:.4f}, Recall: {recall:.4f}, F1: {f1:.4f}")
     
     return {
@@ -204,7 +199,8 @@ urban_rural_metrics = print_multilabel_performance(
 # Examine validation of inquality 
 df_inequality = pd.read_csv('data/validation/lancet_validation_inequality.csv')
 
-df_predictions = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet')[['uri', 'inequality']]
+df_predictions = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet',
+                                 columns=['uri', 'inequality'], engine='pyarrow')
 
 df_inequality_combined = pd.merge(df_inequality, df_predictions, on='uri', how='left')
 
@@ -5,11 +5,52 @@ This script first gets the keyword-based classifications and then take a random
 sample for human annotation.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
 from classify.keyword_classifier import classify_with_keywords
 from utils import load_keywords
 
+DATASET_PATH = 'data/articles/lancet_europe_dataset_with_dummies.parquet'
+HEALTH_SUBSET_PATH = 'data/articles/lancet_europe_health_subset_with_dummies.parquet'
+HEALTH_KEYWORDS_FILE = 'data/translations/health_official_translations.json'
+VALIDATION_SAMPLE_PATH = 'data/samples/validation_sample.parquet'
+INEQUALITY_SAMPLE_PATH = 'data/samples/inequality_validation_sample.parquet'
+
+
+def fast_crosstab(a: pd.Series, b: pd.Series, margins: bool = False) -> pd.DataFrame:
+    """
+    Count co-occurrences of two columns, like pd.crosstab, from integer codes.
+    
+    Args:
+        a: Row variable
+        b: Column variable
+        margins: Whether to add 'All' row and column totals (default: False)
+        
+    Returns:
+        DataFrame of counts indexed by the sorted values of a and b; rows where
+        either value is missing are left out, as in pd.crosstab
+    """
+    valid = (a.notna() & b.notna()).to_numpy()
+    codes_a, values_a = pd.factorize(a[valid], sort=True)
+    codes_b, values_b = pd.factorize(b[valid], sort=True)
+    
+    n_a, n_b = len(values_a), len(values_b)
+    counts = np.bincount(codes_a * n_b + codes_b, minlength=n_a * n_b).reshape(n_a, n_b)
+    table = pd.DataFrame(counts, index=pd.Index(values_a, name=a.name),
+                         columns=pd.Index(values_b, name=b.name))
+    
+    if margins:
+        table['All'] = counts.sum(axis=1)
+        table.loc['All'] = table.sum(axis=0)
+    
+    return table
+
 
 def stratified_sample_from_crosstab(
     df: pd.DataFrame,
@@ -55,43 +96,56 @@ def stratified_sample_from_crosstab(
     print(f"\nCell counts:")
     
     # Show crosstab before sampling
-    crosstab = pd.crosstab(df[var1], df[var2], margins=True)
+    crosstab = fast_crosstab(df[var1], df[var2], margins=True)
     print(crosstab)
     
-    # Store sampled dataframes
-    sampled_dfs = []
+    # Row positions and labels of the sampled rows; the rows themselves are
+    # gathered with a single iloc once every cell has been sampled
+    sampled_positions = []
+    sampled_labels = []
+    
+    # Per-cell report lines, printed together once sampling is done
+    log_lines = []
+    
+    # Row positions of every non-empty cell, from a single grouping pass
+    cell_positions = df.groupby([var1, var2], sort=False).indices
     
     # Sample from each cell
     for val1 in var1_values:
         for val2 in var2_values:
             # Filter to this cell
-            cell_df = df[(df[var1] == val1) & (df[var2] == val2)].copy()
-            cell_size = len(cell_df)
+            positions = cell_positions.get((val1, val2), np.empty(0, dtype=np.intp))
+            cell_size = len(positions)
             
             # Create label for this cell
             label = f"{var1}_{val1}_{var2}_{val2}"
             
-            # Sample from this cell
+            # Sample from this cell; each cell reseeds a RandomState and draws like
+            # DataFrame.sample(random_state=random_state), so existing samples are reproduced
             if cell_size == 0:
-                print(f"\n  {label}: 0 rows (skipping)")
+                log_lines.append(f"\n  {label}: 0 rows (skipping)")
                 continue
             elif cell_size < n_per_cell:
-                print(f"\n  {label}: {cell_size} rows (taking all, requested {n_per_cell})")
-                sample_df = cell_df.copy()
+                log_lines.append(f"\n  {label}: {cell_size} rows (taking all, requested {n_per_cell})")
             else:
-                print(f"\n  {label}: {cell_size} rows (sampling {n_per_cell})")
-                sample_df = cell_df.sample(n=n_per_cell, random_state=random_state)
+                log_lines.append(f"\n  {label}: {cell_size} rows (sampling {n_per_cell})")
+                rng = np.random.RandomState(random_state)
+                positions = positions[rng.choice(cell_size, size=n_per_cell, replace=False)]
             
-            # Add sample label
-            sample_df[sample_label_col] = label
-            sampled_dfs.append(sample_df)
+            sampled_positions.append(positions)
+            sampled_labels.append(label)
+    
+    if log_lines:
+        print("\n".join(log_lines))
     
     # Combine all samples
-    if not sampled_dfs:
+    if not sampled_positions:
         print("\nWARNING: No samples collected")
         result_df = pd.DataFrame()
     else:
-        result_df = pd.concat(sampled_dfs, ignore_index=True)
+        result_df = df.iloc[np.concatenate(sampled_positions)].reset_index(drop=True)
+        # Add sample labels, one per sampled row
+        result_df[sample_label_col] = np.repeat(sampled_labels, [len(p) for p in sampled_positions])
     
     print(f"\n{'='*60}")
     print(f"SAMPLING SUMMARY")
@@ -106,6 +160,11 @@ def stratified_sample_from_crosstab(
     return result_df
 
 
+def _classify_partition(job: dict) -> pd.DataFrame:
+    # Module-level so it can be sent to worker processes; returns a new dataframe
+    return classify_with_keywords(**job)
+
+
 def classify_by_language(
     df: pd.DataFrame,
     text_field: str,
@@ -113,7 +172,8 @@ def classify_by_language(
     lang_column: str = 'lang',
     keywords_file: str = 'data/translations/climate_official_translations.json',
     score_column: str = 'bm25_score',
-    classification_column: str = 'bm25_classification'
+    classification_column: str = 'bm25_classification',
+    max_workers: int = 1
 ) -> pd.DataFrame:
     """
     Classify articles by grouping by language, applying language-specific keywords,
@@ -127,6 +187,8 @@ def classify_by_language(
         keywords_file: Path to keywords JSON file
         score_column: Name of column to store BM25 scores
         classification_column: Name of column to store classifications
+        max_workers: Number of worker processes used to classify languages in parallel
+            (default: 1, classify in this process; None uses every CPU)
         
     Returns:
         DataFrame with added score and classification columns for all languages
@@ -139,19 +201,40 @@ def classify_by_language(
     if lang_column not in df.columns:
         raise ValueError(f"Language column '{lang_column}' not found in dataframe")
     
-    # Get unique languages in the dataframe
-    languages = df[lang_column].dropna().unique()
+    # Get unique languages in the dataframe; as a categorical the unique values are its
+    # categories and rows are grouped by integer code, with -1 marking a missing language
+    lang_values = df[lang_column].astype('category').cat.remove_unused_categories()
+    languages = lang_values.cat.categories
     print(f"Found {len(languages)} languages in dataframe: {sorted(languages)}")
     
-    # Store classified dataframes for each language
+    # Store classified dataframes for each language, with the original row
+    # positions of each so the input order can be restored at the end
     classified_dfs = []
+    classified_positions = []
     
-    # Process each language group
-    for lang in languages:
-        print(f"\nProcessing language: {lang}")
+    # Languages with keywords are classified after the loop: their slot in
+    # classified_dfs, and the arguments for classify_with_keywords
+    pending_langs = []
+    pending_jobs = []
+    
+    # Process each language group; a single groupby pass partitions the frame,
+    # with rows missing a language code collected in their own group
+    lang_codes = lang_values.cat.codes.to_numpy()
+    for code, positions in df.groupby(lang_codes, sort=False).indices.items():
+        lang_df = df.iloc[positions]
+        classified_positions.append(positions)
+        
+        if code < 0:
+            print(f"\nWARNING: {len(lang_df)} articles have missing language codes")
+            print("  These articles will not be classified")
+            lang_df = lang_df.copy()
+            lang_df[score_column] = np.float32(0.0)
+            lang_df[classification_column] = False
+            classified_dfs.append(lang_df)
+            continue
         
-        # Filter dataframe for this language
-        lang_df = df[df[lang_column] == lang].copy()
+        lang = languages[code]
+        print(f"\nProcessing language: {lang}")
         print(f"  Articles in {lang}: {len(lang_df)}")
         
         # Load keywords for this language
@@ -160,146 +243,245 @@ def classify_by_language(
         if not keywords:
             print(f"  WARNING: No keywords found for {lang}, skipping classification")
             # Add empty classification columns for this language
-            lang_df[score_column] = 0.0
+            lang_df = lang_df.copy()
+            lang_df[score_column] = np.float32(0.0)
             lang_df[classification_column] = False
         else:
-            # Classify with language-specific keywords
-            lang_df = classify_with_keywords(
+            # Queue classification with language-specific keywords
+            pending_langs.append((len(classified_dfs), lang))
+            pending_jobs.append(dict(
                 df=lang_df,
                 text_field=text_field,
                 keywords=keywords,
                 threshold=threshold,
                 score_column=score_column,
                 classification_column=classification_column
-            )
-            
-            # Report classification results
-            num_classified = lang_df[classification_column].sum()
-            pct_classified = (num_classified / len(lang_df) * 100) if len(lang_df) > 0 else 0
-            print(f"  Classified: {num_classified} / {len(lang_df)} ({pct_classified:.1f}%)")
+            ))
         
         classified_dfs.append(lang_df)
     
-    # Handle rows with missing language
-    missing_lang_df = df[df[lang_column].isna()]
-    if len(missing_lang_df) > 0:
-        print(f"\nWARNING: {len(missing_lang_df)} articles have missing language codes")
-        print("  These articles will not be classified")
-        missing_lang_df = missing_lang_df.copy()
-        missing_lang_df[score_column] = 0.0
-        missing_lang_df[classification_column] = False
-        classified_dfs.append(missing_lang_df)
+    # Classify the queued languages, spread over worker processes if requested
+    if max_workers == 1:
+        results = [_classify_partition(job) for job in pending_jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_classify_partition, pending_jobs))
+    
+    # Running total for the summary; unclassified partitions contribute nothing
+    total_classified = 0
+    for (slot, lang), lang_df in zip(pending_langs, results):
+        # Classification was thresholded on the full-precision scores; store them as float32
+        lang_df[score_column] = lang_df[score_column].astype(np.float32)
+        lang_df[classification_column] = lang_df[classification_column].astype(bool)
+        classified_dfs[slot] = lang_df
+        
+        # Report classification results
+        num_classified = int(lang_df[classification_column].to_numpy().sum())
+        total_classified += num_classified
+        pct_classified = (num_classified / len(lang_df) * 100) if len(lang_df) > 0 else 0
+        print(f"  Classified {lang}: {num_classified} / {len(lang_df)} ({pct_classified:.1f}%)")
     
     # Combine all classified dataframes
     df_combined = pd.concat(classified_dfs, ignore_index=False)
     
-    # Sort by original index to maintain order
-    df_combined = df_combined.sort_index()
+    # Restore the original row order with an integer sort on row positions
+    order = np.argsort(np.concatenate(classified_positions), kind='stable')
+    df_combined = df_combined.iloc[order]
     
     print(f"\n{'='*60}")
     print(f"TOTAL CLASSIFICATION SUMMARY")
     print(f"{'='*60}")
     print(f"Total articles: {len(df_combined)}")
-    print(f"Total classified: {df_combined[classification_column].sum()}")
-    print(f"Overall percentage: {(df_combined[classification_column].sum() / len(df_combined) * 100):.1f}%")
+    print(f"Total classified: {total_classified}")
+    print(f"Overall percentage: {(total_classified / len(df_combined) * 100):.1f}%")
     print(f"{'='*60}")
     
     return df_combined
 
 
-#if __name__ == "__main__":
-# Load data
-df = pd.read_parquet('data/articles/lancet_europe_dataset_with_dummies.parquet')
-
-# Classify with language-specific keywords
-df = classify_by_language(
-    df, 
-    'body', 
-    keywords_file='data/translations/health_official_translations.json', 
-    threshold=2.0
-)
-
-# Create crosstab of health and bm25_classification
-print("\nCrosstab of health and BM25 classification:")
-print(pd.crosstab(df['health'], df['bm25_classification'], margins=True))
-
-# Plot histogram of BM25 scores
-import matplotlib.pyplot as plt
-
-plt.figure(figsize=(10, 6))
-plt.hist(df['bm25_score'], bins=50, edgecolor='black')
-plt.title('Distribution of BM25 Scores')
-plt.xlabel('BM25 Score')
-plt.ylabel('Number of Articles')
-plt.grid(True, alpha=0.3)
-
-# Add vertical line at threshold
-plt.axvline(x=2.0, color='red', linestyle='--', label='Classification Threshold')
-plt.legend()
-
-plt.tight_layout()
-plt.savefig('data/images/bm25_score_distribution.png')
-plt.close()
-
-print("\nPlot saved to: data/images/bm25_score_distribution.png")
-
-# Take stratified sample from crosstab
-print("\n" + "="*60)
-print("STRATIFIED SAMPLING")
-print("="*60)
-
-df_sample = stratified_sample_from_crosstab(
-    df=df,
-    var1='health',
-    var2='bm25_classification',
-    n_per_cell=25,  # 25 samples per cell
-    sample_label_col='sample_label',
-    random_state=42  # For reproducibility
-)
-
-# Save the sample for human annotation
-if len(df_sample) > 0:
-    output_file = 'data/samples/validation_sample.parquet'
-    df_sample.to_parquet(output_file)
-    print(f"\nSample saved to: {output_file}")
-    
-    # Also save as CSV for easier manual annotation
-    csv_file = 'data/samples/validation_sample.csv'
-    # Select relevant columns for annotation
-    annotation_cols = ['uri', 'title', 'body', 'health', 'bm25_score', 
-                        'bm25_classification', 'sample_label', 'lang', 'source_uri']
-    df_sample[annotation_cols].to_csv(csv_file, index=False)
-    print(f"Sample (CSV) saved to: {csv_file}")
-else:
-    print("\nNo samples collected - skipping save")
-
-# Get validation sample for inquality
-df = pd.read_parquet('data/articles/lancet_europe_health_subset_with_dummies.parquet')
-
-# Take stratified sample for inequality validation
-print("\n" + "="*60)
-print("INEQUALITY VALIDATION SAMPLING")
-print("="*60)
-
-# Sample 15 articles from each inequality class
-inequality_sample = pd.concat([
-    df[df['inequality'] == 0].sample(n=15, random_state=42),
-    df[df['inequality'] == 1].sample(n=15, random_state=42)
-])
-
-# Save the inequality validation sample
-if len(inequality_sample) > 0:
-    output_file = 'data/samples/inequality_validation_sample.parquet'
-    inequality_sample.to_parquet(output_file)
-    print(f"\nInequality sample saved to: {output_file}")
-    
-    # Also save as CSV for easier manual annotation
-    csv_file = 'data/samples/inequality_validation_sample.csv'
-    # Select relevant columns for annotation
-    annotation_cols = ['uri', 'title', 'body', 'inequality', 'source_uri']
-    inequality_sample[annotation_cols].to_csv(csv_file, index=False)
-    print(f"Inequality sample (CSV) saved to: {csv_file}")
-else:
-    print("\nNo inequality samples collected - skipping save")
+def _is_up_to_date(output_file: str, *input_files: str) -> bool:
+    """
+    Check whether an output file exists and is newer than all of its inputs.
+    
+    Args:
+        output_file: Path to the generated file
+        *input_files: Paths to the files it is generated from
+        
+    Returns:
+        True if output_file exists and was modified after every input file
+    """
+    if not os.path.exists(output_file):
+        return False
+    output_mtime = os.path.getmtime(output_file)
+    return all(os.path.getmtime(input_file) < output_mtime for input_file in input_files)
+
+
+def _read_rows(path: str, positions: np.ndarray) -> pd.DataFrame:
+    """
+    Read complete rows of a parquet file by position.
+    
+    Sampling only reads the columns it needs; the saved samples are rebuilt from
+    the full rows so they keep every column of the dataset.
+    
+    Args:
+        path: Path to the parquet file
+        positions: Row positions to read, in the order they should be returned
+        
+    Returns:
+        DataFrame with every column of the file, indexed as when reading the whole file
+    """
+    # Decode only the requested rows rather than the whole file
+    dataset = ds.dataset(path, format='parquet')
+    df = dataset.take(pa.array(positions)).to_pandas()
+    
+    # Files saved with a RangeIndex only describe it in the pandas metadata, so rebuild
+    # the labels the sampled rows have in the full file
+    index_columns = (dataset.schema.pandas_metadata or {}).get('index_columns', [])
+    if not index_columns or isinstance(index_columns[0], dict):
+        index_range = index_columns[0] if index_columns else {'start': 0, 'step': 1, 'name': None}
+        df.index = pd.Index(index_range['start'] + index_range['step'] * np.asarray(positions),
+                            name=index_range['name'])
+    
+    return df
+
+
+def make_bm25_validation_sample():
+    """
+    Classify all articles with BM25 and save a stratified sample for annotation.
+    """
+    # Load data, reading only the columns used for classification and annotation;
+    # _row records each article's position so the sample can be saved with its full row
+    df = pd.read_parquet(DATASET_PATH,
+                         columns=['uri', 'title', 'body', 'health', 'lang', 'source_uri'], engine='pyarrow')
+    df['_row'] = np.arange(len(df))
+
+    # Classify with language-specific keywords
+    df = classify_by_language(
+        df, 
+        'body', 
+        keywords_file=HEALTH_KEYWORDS_FILE, 
+        threshold=2.0,
+        max_workers=None
+    )
+
+    # Create crosstab of health and bm25_classification
+    print("\nCrosstab of health and BM25 classification:")
+    print(fast_crosstab(df['health'], df['bm25_classification'], margins=True))
+
+    # Plot histogram of BM25 scores
+    import matplotlib.pyplot as plt
+
+    # Bin the scores with NumPy and draw the precomputed counts as bars
+    scores = df['bm25_score'].to_numpy(dtype=np.float32)
+    counts, edges = np.histogram(scores, bins=50)
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(edges[:-1], counts, width=np.diff(edges), align='edge', edgecolor='black')
+    plt.title('Distribution of BM25 Scores')
+    plt.xlabel('BM25 Score')
+    plt.ylabel('Number of Articles')
+    plt.grid(True, alpha=0.3)
+
+    # Add vertical line at threshold
+    plt.axvline(x=2.0, color='red', linestyle='--', label='Classification Threshold')
+    plt.legend()
+
+    plt.tight_layout()
+    plt.savefig('data/images/bm25_score_distribution.png')
+    plt.close()
+
+    print("\nPlot saved to: data/images/bm25_score_distribution.png")
+
+    # Take stratified sample from crosstab
+    print("\n" + "="*60)
+    print("STRATIFIED SAMPLING")
+    print("="*60)
 
+    df_sample = stratified_sample_from_crosstab(
+        df=df,
+        var1='health',
+        var2='bm25_classification',
+        n_per_cell=25,  # 25 samples per cell
+        sample_label_col='sample_label',
+        random_state=42  # For reproducibility
+    )
 
+    # The classified frame is no longer needed; free it before reading the sampled rows
+    del df
+
+    # Save the sample for human annotation
+    if len(df_sample) > 0:
+        # Save every dataset column, followed by the classification and sample label
+        sample_cols = ['bm25_score', 'bm25_classification', 'sample_label']
+        df_sample = _read_rows(DATASET_PATH, df_sample['_row'].to_numpy()).reset_index(drop=True).assign(
+            **{col: df_sample[col].to_numpy() for col in sample_cols}
+        )
+        
+        output_file = VALIDATION_SAMPLE_PATH
+        df_sample.to_parquet(output_file, engine='pyarrow', compression='zstd', compression_level=3,
+                             row_group_size=1024)
+        print(f"\nSample saved to: {output_file}")
+    
+        # Also save as CSV for easier manual annotation
+        csv_file = 'data/samples/validation_sample.csv'
+        # Select relevant columns for annotation
+        annotation_cols = ['uri', 'title', 'body', 'health', 'bm25_score', 
+                            'bm25_classification', 'sample_label', 'lang', 'source_uri']
+        pacsv.write_csv(pa.Table.from_pandas(df_sample[annotation_cols], preserve_index=False), csv_file,
+                        write_options=pacsv.WriteOptions(quoting_style='needed'))
+        print(f"Sample (CSV) saved to: {csv_file}")
+    else:
+        print("\nNo samples collected - skipping save")
+
+
+def make_inequality_validation_sample():
+    """
+    Save a per-class sample of the health subset for inequality annotation.
+    """
+    # Get validation sample for inquality
+    # Only the class is needed for sampling; the sampled rows are read in full before saving
+    df = pd.read_parquet(HEALTH_SUBSET_PATH, columns=['inequality'], engine='pyarrow')
+    df['_row'] = np.arange(len(df))
+
+    # Take stratified sample for inequality validation
+    print("\n" + "="*60)
+    print("INEQUALITY VALIDATION SAMPLING")
+    print("="*60)
+
+    # Sample 15 articles from each inequality class, split in one grouping pass; each class
+    # is drawn with its own seeded sample call so existing samples are reproduced
+    inequality_sample = pd.concat([
+        group.sample(n=15, random_state=42) for _, group in df.groupby('inequality', sort=True)
+    ])
+
+    # Save the inequality validation sample
+    if len(inequality_sample) > 0:
+        inequality_sample = _read_rows(HEALTH_SUBSET_PATH, inequality_sample['_row'].to_numpy())
+        
+        output_file = INEQUALITY_SAMPLE_PATH
+        inequality_sample.to_parquet(output_file, engine='pyarrow', compression='zstd', compression_level=3,
+                                     row_group_size=1024)
+        print(f"\nInequality sample saved to: {output_file}")
+    
+        # Also save as CSV for easier manual annotation
+        csv_file = 'data/samples/inequality_validation_sample.csv'
+        # Select relevant columns for annotation
+        annotation_cols = ['uri', 'title', 'body', 'inequality', 'source_uri']
+        pacsv.write_csv(pa.Table.from_pandas(inequality_sample[annotation_cols], preserve_index=False), csv_file,
+                        write_options=pacsv.WriteOptions(quoting_style='needed'))
+        print(f"Inequality sample (CSV) saved to: {csv_file}")
+    else:
+        print("\nNo inequality samples collected - skipping save")
+
+
+if __name__ == "__main__":
+    # Samples are drawn with fixed seeds, so they only need rebuilding when an input changes
+    if _is_up_to_date(VALIDATION_SAMPLE_PATH, DATASET_PATH, HEALTH_KEYWORDS_FILE):
+        print(f"{VALIDATION_SAMPLE_PATH} is newer than its inputs - skipping BM25 validation sampling")
+    else:
+        make_bm25_validation_sample()
+    
+    if _is_up_to_date(INEQUALITY_SAMPLE_PATH, HEALTH_SUBSET_PATH):
+        print(f"{INEQUALITY_SAMPLE_PATH} is newer than its inputs - skipping inequality validation sampling")
+    else:
+        make_inequality_validation_sample()